@@ -4,9 +4,11 @@ For more information, see: https://adventofcode.com/2021/day/1
 """
 import sys
 import os
+from collections import deque
 
 sys.path.append("..")
 import utils.read_input as read_input
+import utils.lru_cache as lru_cache
 
 
 def parse_inputs(input_list):
@@ -51,6 +53,100 @@ def get_adj_increasing_count(num_list):
     return increasing_count
 
 
+class DepthTracker:
+    """Incrementally tracks how often depth readings increase, one reading at a time.
+    Comparing two rolling windows that share all but one value only needs the value entering and
+    the value leaving the window, so each update is O(1).
+    """
+    def __init__(self, window_size=3):
+        """Constructor
+
+        Args:
+            window_size (int): size of rolling window.
+        """
+        self.window_size = window_size
+
+        # last window_size readings, where the oldest is the one leaving the next window
+        self.recent_values = deque(maxlen=window_size)
+        self.prev_value = None
+
+        self.increasing_count = 0
+        self.window_increasing_count = 0
+
+    def update(self, curr_val):
+        """Adds a new depth reading.
+
+        Args:
+            curr_val (integer): new depth reading.
+        """
+        # check if the current value is higher than the previous
+        if self.prev_value is not None and curr_val > self.prev_value:
+            self.increasing_count += 1
+        self.prev_value = curr_val
+
+        # new window sum is higher only if the value entering is higher than the one leaving
+        if len(self.recent_values) == self.window_size and curr_val > self.recent_values[0]:
+            self.window_increasing_count += 1
+        self.recent_values.append(curr_val)
+
+
+class DepthQuery:
+    """Answers window questions about a fixed list of depth readings, caching prefix sums and
+    answers for each window size in a bounded LRU cache.
+    """
+    def __init__(self, num_list, cache_size=128):
+        """Constructor
+
+        Args:
+            num_list ([integer]): list of depth readings.
+            cache_size (int): max number of cached intermediates and answers.
+        """
+        self.num_list = num_list
+        self.cache = lru_cache.LRUCache(cache_size)
+
+    def prefix_sums(self):
+        """Gets the running sums of the readings, starting with 0.
+
+        Returns:
+            [integer]: list where index i is the sum of the first i readings.
+        """
+        def compute_prefix_sums():
+            sums = [0]
+            for curr_val in self.num_list:
+                sums.append(sums[-1] + curr_val)
+            return sums
+
+        return self.cache.get_or_compute("prefix_sums", compute_prefix_sums)
+
+    def window_sums(self, window_size):
+        """Gets the sum of each full rolling window.
+
+        Args:
+            window_size ([integer]): size of rolling window.
+
+        Returns:
+            [integer]: sum of each window of window_size readings.
+        """
+        def compute_window_sums():
+            sums = self.prefix_sums()
+            return [sums[i + window_size] - sums[i] for i in range(len(sums) - window_size)]
+
+        return self.cache.get_or_compute(("window_sums", window_size), compute_window_sums)
+
+    def increasing_count(self, window_size=1):
+        """Gets the number of times a rolling window is increasing.
+
+        Args:
+            window_size ([integer]): size of rolling window.
+
+        Returns:
+            [integer]: number of times a subsequent window increases in value.
+        """
+        return self.cache.get_or_compute(
+            ("increasing_count", window_size),
+            lambda: get_adj_increasing_count(self.window_sums(window_size)))
+
+
 def day1_pt1(input_file):
     """Gets the number of rows where the value is increasing, given an input file of integers.
 
@@ -23,6 +23,57 @@ def parse_input(input_lines):
     for curr_val in input_lines]
 
 
+class SubmarineTracker:
+    """Incrementally tracks submarine position for both parts, one command at a time.
+    """
+    def __init__(self):
+        """Constructor
+        """
+        self.horizontal = 0
+
+        # depth for part 1, where up and down move the submarine directly
+        self.depth = 0
+
+        # aim and depth for part 2, where up and down change the aim
+        self.aim = 0
+        self.aimed_depth = 0
+
+    def update(self, command, value):
+        """Applies a command to the submarine.
+
+        Args:
+            command (string): direction, one of forward, down, or up.
+            value (integer): amount to move in direction.
+        """
+        if command == "forward":
+            self.horizontal += value
+            self.aimed_depth += self.aim * value
+        elif command == "down":
+            self.depth += value
+            self.aim += value
+        elif command == "up":
+            self.depth -= value
+            self.aim -= value
+        else:
+            raise ValueError(f"Unknown command: {command}")
+
+    def pt1_position(self):
+        """Gets the position of the submarine for Part 1.
+
+        Returns:
+            [integer]: horizontal position multipled by depth position.
+        """
+        return self.horizontal * self.depth
+
+    def pt2_position(self):
+        """Gets the position of the submarine for Part 2.
+
+        Returns:
+            [integer]: horizontal position multipled by depth position using aim.
+        """
+        return self.horizontal * self.aimed_depth
+
+
 def day2_pt1(input_file):
     """Determines final position of submarine for Part 1 after executing commands from input_file.
 
@@ -5,6 +5,8 @@ For more information, see: https://adventofcode.com/2021/day/3
 import sys
 import os
 
+import numpy as np
+
 sys.path.append("..")
 import utils.read_input as read_input
 
@@ -21,6 +23,153 @@ def parse_input(input_lines):
     return [x.strip() for x in input_lines]
 
 
+def pack_report(input_lines, chunk_bytes=1 << 22):
+    """Parses binary numbers into a packed bit matrix, with 8 bits per byte and first bit as MSB.
+    Lines are converted a chunk at a time, so memory is about 1 bit per report bit.
+
+    Args:
+        input_lines (iterable of string): binary numbers, all of the same width.
+        chunk_bytes (int): approximate number of report bits to convert at a time, which sets
+            the size of the temporary text and unpacked bit buffers.
+
+    Returns:
+        (np.ndarray): uint8 matrix of shape (rows, ceil(n_bits / 8)).
+        (int): number of bits in each binary number.
+    """
+    n_bits = None
+    chunk_rows = None
+    packed_chunks = []
+    chunk_text = bytearray()
+    n_chunk_rows = 0
+
+    def pack_chunk():
+        chunk_bits = np.frombuffer(chunk_text, dtype=np.uint8).reshape(n_chunk_rows, n_bits)
+        packed_chunks.append(np.packbits(chunk_bits == ord("1"), axis=1))
+
+    for line in input_lines:
+        line = line.strip()
+        if line == "":
+            continue
+
+        if n_bits is None:
+            n_bits = len(line)
+            chunk_rows = max(1, chunk_bytes // n_bits)
+        elif len(line) != n_bits:
+            raise ValueError(f"Expected {n_bits} bits, got {len(line)}: {line}")
+
+        chunk_text += line.encode("ascii")
+        n_chunk_rows += 1
+        if n_chunk_rows == chunk_rows:
+            pack_chunk()
+            chunk_text = bytearray()
+            n_chunk_rows = 0
+
+    if n_bits is None:
+        raise ValueError("Report has no binary numbers.")
+    if n_chunk_rows > 0:
+        pack_chunk()
+
+    return np.concatenate(packed_chunks), n_bits
+
+
+def packed_bits_to_int(packed_row, n_bits):
+    """Converts a packed row of bits into an int.
+
+    Args:
+        packed_row (np.ndarray): uint8 array of packed bits, first bit as MSB.
+        n_bits (int): number of bits in the row.
+
+    Returns:
+        (int): value of the binary number.
+    """
+    return int.from_bytes(packed_row.tobytes(), "big") >> (len(packed_row) * 8 - n_bits)
+
+
+def count_ones_per_column(packed, n_bits, chunk_bytes=1 << 22):
+    """Counts the number of 1 bits in each column of a packed bit matrix.
+
+    Args:
+        packed (np.ndarray): uint8 matrix of packed bits.
+        n_bits (int): number of bits in each row.
+        chunk_bytes (int): approximate number of bits to unpack at a time, one byte each.
+
+    Returns:
+        (np.ndarray): count of 1 bits for each column.
+    """
+    one_counts = np.zeros(n_bits, dtype=np.int64)
+    chunk_rows = max(1, chunk_bytes // n_bits)
+    for chunk_start in range(0, len(packed), chunk_rows):
+        chunk_bits = np.unpackbits(packed[chunk_start:chunk_start + chunk_rows], axis=1,
+                                   count=n_bits)
+        one_counts += chunk_bits.sum(axis=0, dtype=np.int64)
+
+    return one_counts
+
+
+def packed_power_consumption(packed, n_bits):
+    """Computes the power consumption (gamma rate * epsilon rate) from a packed report.
+
+    Args:
+        packed (np.ndarray): uint8 matrix of packed bits.
+        n_bits (int): number of bits in each row.
+
+    Returns:
+        [integer]: gamma rate multiplied by epsilon rate.
+    """
+    # most common bit is 1 when tied, and least common bit is the opposite
+    most_common_bits = 2 * count_ones_per_column(packed, n_bits) >= len(packed)
+    gamma_rate = packed_bits_to_int(np.packbits(most_common_bits), n_bits)
+    epsilon_rate = gamma_rate ^ ((1 << n_bits) - 1)
+
+    return gamma_rate * epsilon_rate
+
+
+def packed_rating(packed, n_bits, keep_most_common):
+    """Filters a packed report bit by bit until a single number remains.
+
+    Args:
+        packed (np.ndarray): uint8 matrix of packed bits.
+        n_bits (int): number of bits in each row.
+        keep_most_common (boolean): keep rows with the most common bit (1 when tied), as for
+            the oxygen rating, otherwise the least common bit (0 when tied), as for CO2.
+
+    Returns:
+        (int): value of the remaining binary number.
+    """
+    curr_rows = packed
+    for bit_index in range(n_bits):
+        # edge case: only 1 row left
+        if len(curr_rows) == 1:
+            break
+
+        # count 1 bits in the current column straight from the packed bytes
+        bit_mask = np.uint8(1 << (7 - bit_index % 8))
+        has_one = (curr_rows[:, bit_index // 8] & bit_mask) != 0
+        num_one = int(np.count_nonzero(has_one))
+        num_zero = len(curr_rows) - num_one
+
+        keep_one = (num_one >= num_zero) == keep_most_common
+        curr_rows = curr_rows[has_one == keep_one]
+
+    if len(curr_rows) == 0:
+        raise ValueError("Every number was filtered out of the report.")
+
+    return packed_bits_to_int(curr_rows[0], n_bits)
+
+
+def packed_life_support(packed, n_bits):
+    """Computes the life support rating (oxygen rating * CO2 rating) from a packed report.
+
+    Args:
+        packed (np.ndarray): uint8 matrix of packed bits.
+        n_bits (int): number of bits in each row.
+
+    Returns:
+        [integer]: oxygen rating multiplied by CO2 rating.
+    """
+    return packed_rating(packed, n_bits, True) * packed_rating(packed, n_bits, False)
+
+
 def day3_pt1(input_file):
     """Determines final position of submarine for Part 1 after executing commands from input_file.
 
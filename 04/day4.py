@@ -4,7 +4,12 @@ For more information, see: https://adventofcode.com/2021/day/4
 """
 import sys
 import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from functools import reduce
+from multiprocessing import shared_memory
+
+import numpy as np
 
 sys.path.append("..")
 import utils.read_input as read_input
@@ -80,6 +85,177 @@ class BingoBoard:
         return reduce(lambda x, y: x + y, set_diff)
 
 
+class BingoDeck:
+    """Compact storage for many bingo boards of the same shape.
+    All board numbers live in one contiguous array of unsigned shorts, with a parallel bitmask of
+    marked cells and a running unmarked sum per board, so marking and scoring are cheap.
+    Boards can have at most 64 cells, and numbers must fit in an unsigned short.
+    """
+    def __init__(self, n_rows=5, n_cols=5, index_numbers=True):
+        """Constructor
+
+        Args:
+            n_rows (int): number of rows on each board.
+            n_cols (int): number of columns on each board.
+            index_numbers (boolean): whether to index cells by number, which is needed for
+                mark_number but not for play_bingo_tournament.
+        """
+        if n_rows * n_cols > 64:
+            raise ValueError("Boards can have at most 64 cells.")
+
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.n_cells = n_rows * n_cols
+        self.index_numbers = index_numbers
+
+        # flat numbers for all boards, and per-board marked bitmask and unmarked sum
+        self.numbers = array("H")
+        self.marked = array("Q")
+        self.unmarked_sums = array("Q")
+
+        # index of number: flat cell positions across the deck that hold the number
+        self.number_positions = {}
+
+        # bitmasks for each complete row and column on a board
+        self.win_masks = [((1 << n_cols) - 1) << (row * n_cols) for row in range(n_rows)]
+        self.win_masks += [sum(1 << (row * n_cols + col) for row in range(n_rows))
+                           for col in range(n_cols)]
+
+    @classmethod
+    def from_boards(cls, bingo_boards):
+        """Creates a deck from a list of BingoBoard objects.
+
+        Args:
+            bingo_boards ([BingoBoard]): boards to add to the deck.
+
+        Returns:
+            BingoDeck: deck containing all the boards.
+        """
+        deck = cls(len(bingo_boards[0].board), len(bingo_boards[0].board[0]))
+        for board in bingo_boards:
+            deck.add_board(val for row in board.board for val in row)
+
+        return deck
+
+    def __len__(self):
+        return len(self.marked)
+
+    def __getitem__(self, board_index):
+        if not -len(self) <= board_index < len(self):
+            raise IndexError("board index out of range")
+
+        return BingoBoardView(self, board_index % len(self))
+
+    def add_board(self, board_numbers):
+        """Adds a board to the deck.
+
+        Args:
+            board_numbers (iterable of int): numbers on the board in row-major order.
+
+        Returns:
+            BingoBoardView: view for the added board.
+        """
+        board_index = len(self)
+        first_position = len(self.numbers)
+        self.numbers.extend(board_numbers)
+        if len(self.numbers) - first_position != self.n_cells:
+            del self.numbers[first_position:]
+            raise ValueError(f"Board must have exactly {self.n_cells} numbers.")
+
+        # index each cell by its number
+        if self.index_numbers:
+            for position in range(first_position, first_position + self.n_cells):
+                self.number_positions.setdefault(self.numbers[position],
+                                                 array("L")).append(position)
+
+        self.marked.append(0)
+        self.unmarked_sums.append(sum(self.numbers[first_position:]))
+
+        return BingoBoardView(self, board_index)
+
+    def has_board_won(self, board_index):
+        """Checks if a board has a complete row or column marked.
+
+        Args:
+            board_index (int): index of board in the deck.
+
+        Returns:
+            boolean: true if a row or column is fully marked.
+        """
+        marked = self.marked[board_index]
+        return any(marked & mask == mask for mask in self.win_masks)
+
+    def mark_number(self, drawn_number):
+        """Marks a drawn number on every board in the deck.
+
+        Args:
+            drawn_number (int): number that was drawn.
+
+        Returns:
+            [int]: indexes of boards that won for the first time with this number.
+        """
+        if not self.index_numbers:
+            raise ValueError("Deck was created without a number index, so it can't be marked.")
+
+        new_winners = []
+        for position in self.number_positions.get(drawn_number, ()):
+            board_index, cell_index = divmod(position, self.n_cells)
+            cell_bit = 1 << cell_index
+
+            # skip cells that were already marked by an earlier draw of the same number
+            if self.marked[board_index] & cell_bit:
+                continue
+
+            had_won = self.has_board_won(board_index)
+            self.marked[board_index] |= cell_bit
+            self.unmarked_sums[board_index] -= drawn_number
+
+            if not had_won and self.has_board_won(board_index):
+                new_winners.append(board_index)
+
+        return new_winners
+
+
+class BingoBoardView:
+    """Lightweight view of a single board stored in a BingoDeck.
+    """
+    __slots__ = ("deck", "index")
+
+    def __init__(self, deck, index):
+        """Constructor
+
+        Args:
+            deck (BingoDeck): deck that stores the board.
+            index (int): index of board in the deck.
+        """
+        self.deck = deck
+        self.index = index
+
+    @property
+    def board(self):
+        """[[int]]: matrix of ints that represents the bingo board."""
+        first_position = self.index * self.deck.n_cells
+        return [list(self.deck.numbers[row_start:row_start + self.deck.n_cols])
+                for row_start in range(first_position, first_position + self.deck.n_cells,
+                                       self.deck.n_cols)]
+
+    def has_board_won(self):
+        """Checks if the board is a winner.
+
+        Returns:
+            boolean: true if a row or column has all numbers marked.
+        """
+        return self.deck.has_board_won(self.index)
+
+    def compute_final_board_score(self):
+        """Gets the sum of all numbers on the board that haven't been marked.
+
+        Returns:
+            int: total sum of all numbers that were not drawn during the game.
+        """
+        return self.deck.unmarked_sums[self.index]
+
+
 def parse_inputs(input_list):
     """Parses inputs into list of drawn numbers and list of BingoBoard objects.
 
@@ -115,6 +291,200 @@ def parse_inputs(input_list):
 
     return drawn_numbers, bingo_boards
 
+def stream_inputs(line_iter, index_numbers=True):
+    """Parses drawn numbers and bingo boards from an iterator of lines without holding all lines.
+    The drawn numbers are read right away, while boards are parsed lazily into a BingoDeck.
+
+    Args:
+        line_iter (iterable of string): lines of the input, such as an open file.
+        index_numbers (boolean): whether the deck should index cells by number, see BingoDeck.
+
+    Returns:
+        [int]: list of numbers drawn during bingo game.
+        generator of BingoBoardView: views of boards in the deck, yielded as each is parsed.
+    """
+    line_iter = iter(line_iter)
+    drawn_numbers = [int(num) for num in next(line_iter).strip().split(",")]
+
+    return drawn_numbers, stream_boards(line_iter, index_numbers)
+
+
+def stream_boards(line_iter, index_numbers=True):
+    """Parses bingo boards from an iterator of lines into a BingoDeck.
+    Board shape is taken from the first board. Every board must end on a blank line or at the
+    end of the input, and must have the same shape as the first.
+
+    Args:
+        line_iter (iterable of string): lines of bingo boards, separated by blank lines.
+        index_numbers (boolean): whether the deck should index cells by number, see BingoDeck.
+
+    Yields:
+        BingoBoardView: view of each board as soon as it has been added to the deck.
+
+    Raises:
+        ValueError: if a board's shape doesn't match the first board.
+    """
+    deck = None
+    first_board_rows = 0
+    board_buffer = array("H")
+    n_filled = 0
+
+    def finish_board():
+        """Adds the filled buffer to the deck, creating the deck from the first board."""
+        nonlocal deck, n_filled
+        if deck is None:
+            deck = BingoDeck(first_board_rows, n_filled // first_board_rows, index_numbers)
+        elif n_filled != deck.n_cells:
+            raise ValueError(f"Board {len(deck)} has {n_filled} numbers, "
+                             f"expected {deck.n_cells}.")
+
+        n_filled = 0
+        return deck.add_board(board_buffer)
+
+    for line in line_iter:
+        row_values = line.split()
+
+        # blank lines end the current board, if any
+        if len(row_values) == 0:
+            if n_filled > 0:
+                yield finish_board()
+            continue
+
+        if deck is None:
+            # first board: grow buffer until the shape is known
+            if first_board_rows > 0 and len(row_values) != n_filled // first_board_rows:
+                raise ValueError("Rows of the first board must all have the same length.")
+            board_buffer.extend(int(num) for num in row_values)
+            first_board_rows += 1
+            n_filled = len(board_buffer)
+            continue
+
+        if len(row_values) != deck.n_cols:
+            raise ValueError(f"Board {len(deck)} has a row with {len(row_values)} numbers, "
+                             f"expected {deck.n_cols}.")
+        if n_filled == deck.n_cells:
+            raise ValueError(f"Board {len(deck)} has more than {deck.n_rows} rows.")
+
+        # fill preallocated buffer in place
+        for num in row_values:
+            board_buffer[n_filled] = int(num)
+            n_filled += 1
+
+    # last board may not have a trailing blank line
+    if n_filled > 0:
+        yield finish_board()
+
+
+def score_bingo_shard(boards_name, results_name, n_boards, board_shape, drawn_numbers, shard,
+                      chunk_size=65536):
+    """Computes the winning turn and score for a shard of boards stored in shared memory.
+
+    Args:
+        boards_name (string): name of shared memory block holding an (n_boards, n_cells)
+            uint16 array of board numbers in row-major order.
+        results_name (string): name of shared memory block holding a (2, n_boards) int64 array,
+            where row 0 receives the winning turn and row 1 the score of each board.
+        n_boards (int): number of boards.
+        board_shape (tuple of int): number of rows and columns on each board.
+        drawn_numbers ([int]): numbers drawn during bingo game.
+        shard (tuple of int): first board and end board (exclusive) to score.
+        chunk_size (int): number of boards to score at a time, to bound memory.
+    """
+    n_rows, n_cols = board_shape
+    n_draws = len(drawn_numbers)
+    boards_memory = shared_memory.SharedMemory(name=boards_name)
+    results_memory = shared_memory.SharedMemory(name=results_name)
+    try:
+        boards = np.ndarray((n_boards, n_rows * n_cols), dtype=np.uint16, buffer=boards_memory.buf)
+        results = np.ndarray((2, n_boards), dtype=np.int64, buffer=results_memory.buf)
+
+        # turn on which each number is first drawn, where numbers never drawn get n_draws
+        draws = np.asarray(drawn_numbers, dtype=np.int64)
+        draw_turns = np.full(max(int(draws.max()), np.iinfo(np.uint16).max) + 1, n_draws,
+                             dtype=np.int64)
+        unique_draws, first_turns = np.unique(draws, return_index=True)
+        draw_turns[unique_draws] = first_turns
+
+        for chunk_start in range(shard[0], shard[1], chunk_size):
+            chunk_end = min(chunk_start + chunk_size, shard[1])
+            chunk_boards = boards[chunk_start:chunk_end]
+            cell_turns = draw_turns[chunk_boards].reshape(-1, n_rows, n_cols)
+
+            # a line is complete on the turn its last number is drawn
+            win_turns = np.minimum(cell_turns.max(axis=2).min(axis=1),
+                                   cell_turns.max(axis=1).min(axis=1))
+
+            # score is the sum of numbers not drawn by the winning turn times the winning number
+            is_unmarked = cell_turns.reshape(len(chunk_boards), -1) > win_turns[:, None]
+            unmarked_sums = np.where(is_unmarked, chunk_boards, 0).sum(axis=1, dtype=np.int64)
+            has_won = win_turns < n_draws
+            winning_numbers = draws[np.minimum(win_turns, n_draws - 1)]
+
+            results[0, chunk_start:chunk_end] = win_turns
+            results[1, chunk_start:chunk_end] = np.where(has_won, unmarked_sums * winning_numbers,
+                                                         -1)
+    finally:
+        boards_memory.close()
+        results_memory.close()
+
+
+def play_bingo_tournament(drawn_numbers, deck, n_workers=None, boards_per_shard=None):
+    """Computes the winning turn and score of every board, with boards sharded across processes.
+    All boards are placed in one shared memory array that every worker reads its shard from.
+
+    Args:
+        drawn_numbers ([int]): numbers drawn during bingo game.
+        deck (BingoDeck): boards to play.
+        n_workers (int, optional): number of worker processes. Uses the CPU count if None.
+        boards_per_shard (int, optional): boards per shard. Splits evenly across workers if None.
+
+    Returns:
+        (np.ndarray): indexes of boards that win, in the order they win. Boards that win on the
+            same turn are ordered by index, so the first is the part 1 winner and the last is
+            the part 2 winner.
+        (np.ndarray): turn on which each board wins, or len(drawn_numbers) if it never wins.
+        (np.ndarray): score of each board when it wins, or -1 if it never wins.
+    """
+    if len(drawn_numbers) == 0:
+        raise ValueError("At least one number must be drawn.")
+
+    n_workers = n_workers or os.cpu_count() or 1
+    n_boards = len(deck)
+    boards_per_shard = boards_per_shard or max(1, -(-n_boards // n_workers))
+
+    boards_memory = shared_memory.SharedMemory(create=True, size=max(1, len(deck.numbers) * 2))
+    results_memory = shared_memory.SharedMemory(create=True, size=max(1, 2 * n_boards * 8))
+    try:
+        np.ndarray(len(deck.numbers), dtype=np.uint16, buffer=boards_memory.buf)[:] = \
+            np.frombuffer(deck.numbers, dtype=np.uint16)
+
+        shards = [(shard_start, min(shard_start + boards_per_shard, n_boards))
+                  for shard_start in range(0, n_boards, boards_per_shard)]
+        shard_args = [(boards_memory.name, results_memory.name, n_boards,
+                       (deck.n_rows, deck.n_cols), drawn_numbers, shard) for shard in shards]
+
+        # skip the process pool when there's nothing to split
+        if n_workers == 1 or len(shards) == 1:
+            for args in shard_args:
+                score_bingo_shard(*args)
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                list(executor.map(score_bingo_shard, *zip(*shard_args)))
+
+        results = np.ndarray((2, n_boards), dtype=np.int64, buffer=results_memory.buf).copy()
+    finally:
+        boards_memory.close()
+        boards_memory.unlink()
+        results_memory.close()
+        results_memory.unlink()
+
+    win_turns, scores = results
+    ranking = np.lexsort((np.arange(n_boards), win_turns))
+    ranking = ranking[win_turns[ranking] < len(drawn_numbers)]
+
+    return ranking, win_turns, scores
+
+
 def day4_pt1(input_file):
     """Computes the score of a winning bingo board, given bingo boards and a drawing of numbers.
     Score is the sum of all numbers that were not drawn multipled by the last drawn number.
@@ -2,9 +2,15 @@
 This module provides a solution for Advent of Code, Day 5: Hydrothermal Venture.
 For more information, see: https://adventofcode.com/2021/day/5.
 """
+from concurrent.futures import ProcessPoolExecutor
 from functools import reduce
+from multiprocessing import shared_memory
 import sys
 import os
+import shutil
+import tempfile
+
+import numpy as np
 
 sys.path.append("..")
 import utils.read_input as read_input
@@ -75,6 +81,471 @@ def update_matrix_for_line(matrix, start_coord, end_coord, include_diagonal):
 
     return matrix
 
+def get_line_coords(start_coord, end_coord):
+    """Generates each (x, y) coord on a horizontal, vertical, or 45 degree diagonal line.
+
+    Args:
+        start_coord (tuple of int): tuple of int representing start x, y coords.
+        end_coord (tuple of int): tuple of int representing end x, y coords.
+
+    Yields:
+        (tuple of int): x, y coords along the line, including both endpoints.
+    """
+    # store the direction in which to step x and y forward (0 if coord doesn't change)
+    x_step = (end_coord[0] > start_coord[0]) - (end_coord[0] < start_coord[0])
+    y_step = (end_coord[1] > start_coord[1]) - (end_coord[1] < start_coord[1])
+    n_steps = max(abs(end_coord[0] - start_coord[0]), abs(end_coord[1] - start_coord[1]))
+
+    for step in range(n_steps + 1):
+        yield (start_coord[0] + step * x_step, start_coord[1] + step * y_step)
+
+
+class VentMap:
+    """Incremental map of hydrothermal vents on the ocean floor.
+    Segments can be added and removed one at a time, while the number of locations where 2+ lines
+    overlap is kept up to date, so querying it doesn't require recounting the whole floor.
+    """
+    def __init__(self, include_diagonal=True):
+        """Constructor
+
+        Args:
+            include_diagonal (boolean): whether diagonal lines should be considered.
+        """
+        self.include_diagonal = include_diagonal
+
+        # sparse grid of (x, y): count, only storing cells that have at least 1 line
+        self.cell_counts = {}
+
+        # number of times each segment has been added, so removals can be validated
+        self.segment_counts = {}
+
+        # running count of cells where 2+ lines overlap
+        self.n_overlaps = 0
+
+    def _is_tracked(self, start_coord, end_coord):
+        """Checks if a segment affects the map, given whether diagonals are considered.
+
+        Args:
+            start_coord (tuple of int): tuple of int representing start x, y coords.
+            end_coord (tuple of int): tuple of int representing end x, y coords.
+
+        Returns:
+            boolean: true if the segment should be drawn on the map.
+        """
+        is_vertical = start_coord[0] == end_coord[0]
+        is_horizontal = start_coord[1] == end_coord[1]
+        return is_vertical or is_horizontal or self.include_diagonal
+
+    def add_segment(self, start_coord, end_coord):
+        """Adds a line to the map, incrementing every cell along it.
+
+        Args:
+            start_coord (tuple of int): tuple of int representing start x, y coords.
+            end_coord (tuple of int): tuple of int representing end x, y coords.
+        """
+        segment = (tuple(start_coord), tuple(end_coord))
+        self.segment_counts[segment] = self.segment_counts.get(segment, 0) + 1
+        if not self._is_tracked(start_coord, end_coord):
+            return
+
+        for coord in get_line_coords(start_coord, end_coord):
+            new_count = self.cell_counts.get(coord, 0) + 1
+            self.cell_counts[coord] = new_count
+
+            # cell just crossed the overlap threshold
+            if new_count == 2:
+                self.n_overlaps += 1
+
+    def remove_segment(self, start_coord, end_coord):
+        """Removes a previously added line from the map, decrementing every cell along it.
+
+        Args:
+            start_coord (tuple of int): tuple of int representing start x, y coords.
+            end_coord (tuple of int): tuple of int representing end x, y coords.
+
+        Raises:
+            ValueError: if the segment is not currently on the map.
+        """
+        segment = (tuple(start_coord), tuple(end_coord))
+        segment_count = self.segment_counts.get(segment, 0)
+        if segment_count == 0:
+            raise ValueError(f"Segment {segment} is not on the map.")
+
+        if segment_count == 1:
+            del self.segment_counts[segment]
+        else:
+            self.segment_counts[segment] = segment_count - 1
+
+        if not self._is_tracked(start_coord, end_coord):
+            return
+
+        for coord in get_line_coords(start_coord, end_coord):
+            new_count = self.cell_counts[coord] - 1
+
+            # drop empty cells to keep the grid sparse
+            if new_count == 0:
+                del self.cell_counts[coord]
+            else:
+                self.cell_counts[coord] = new_count
+
+            # cell just dropped below the overlap threshold
+            if new_count == 1:
+                self.n_overlaps -= 1
+
+    def overlap_count(self):
+        """Gets the number of locations where 2+ lines overlap.
+
+        Returns:
+            (int): count of locations where 2+ lines overlap.
+        """
+        return self.n_overlaps
+
+
+def clip_line_to_tile(start_coord, end_coord, tile_bounds):
+    """Clips a horizontal, vertical, or 45 degree diagonal line to a rectangular tile.
+
+    Args:
+        start_coord (tuple of int): tuple of int representing start x, y coords.
+        end_coord (tuple of int): tuple of int representing end x, y coords.
+        tile_bounds (tuple of int): (x_start, y_start, x_end, y_end) of tile, end exclusive.
+
+    Returns:
+        (tuple of np.ndarray): x and y coords of the line that fall within the tile.
+    """
+    x_step = (end_coord[0] > start_coord[0]) - (end_coord[0] < start_coord[0])
+    y_step = (end_coord[1] > start_coord[1]) - (end_coord[1] < start_coord[1])
+    n_steps = max(abs(end_coord[0] - start_coord[0]), abs(end_coord[1] - start_coord[1]))
+
+    # find the range of steps along the line where each coord is inside the tile
+    first_step = 0
+    last_step = n_steps
+    for start, step, lower, upper in ((start_coord[0], x_step, tile_bounds[0], tile_bounds[2]),
+                                      (start_coord[1], y_step, tile_bounds[1], tile_bounds[3])):
+        if step == 0:
+            if not lower <= start < upper:
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        elif step > 0:
+            first_step = max(first_step, lower - start)
+            last_step = min(last_step, upper - 1 - start)
+        else:
+            first_step = max(first_step, start - (upper - 1))
+            last_step = min(last_step, start - lower)
+
+    steps = np.arange(first_step, last_step + 1, dtype=np.int64)
+    return start_coord[0] + steps * x_step, start_coord[1] + steps * y_step
+
+
+class TiledVentGrid:
+    """Dense ocean floor grid of small unsigned ints, backed by a memory-mapped .npy file.
+    The grid is stored tile by tile, so each tile is one contiguous block of the file. Segments
+    are rasterized one tile at a time, so only a single tile is held in memory, and the file is
+    remapped after each tile, so pages of finished tiles don't stay resident. Tiles that
+    no segment crosses are never written. Counts saturate at the max value of dtype.
+    The grid starts empty, and a running count of cells where 2+ lines overlap is kept across
+    every call that rasterizes onto it.
+    """
+    def __init__(self, width, height, filename=None, tile_size=1024, dtype=np.uint8):
+        """Constructor
+
+        Args:
+            width (int): number of columns (x coords) on the ocean floor.
+            height (int): number of rows (y coords) on the ocean floor.
+            filename (string, optional): .npy file to store the grid in. Uses a temp file if None.
+            tile_size (int): number of rows and columns in each tile.
+            dtype (np.dtype): unsigned int type used to store the count for each cell.
+        """
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.max_count = np.iinfo(dtype).max
+
+        # create a temp directory for the grid if no file is given, which is removed on close
+        self.temp_dir = None
+        if filename is None:
+            self.temp_dir = tempfile.mkdtemp()
+            filename = os.path.join(self.temp_dir, "grid.npy")
+        self.filename = filename
+
+        # pad the grid up to whole tiles, where padding cells are never written
+        self.n_tile_rows = -(-height // tile_size)
+        self.n_tile_cols = -(-width // tile_size)
+        self.grid = np.lib.format.open_memmap(
+            filename, mode="w+", dtype=dtype,
+            shape=(self.n_tile_rows, self.n_tile_cols, tile_size, tile_size))
+
+        # running count of cells on the whole grid where 2+ lines overlap
+        self.n_overlaps = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def heatmap(self):
+        """Gets the grid of counts for each cell, without copying it into memory.
+        The count for cell (x, y) is at [y // tile_size, x // tile_size, y % tile_size,
+        x % tile_size]. To get a matrix indexed by [y, x], which copies the grid, use
+        heatmap().transpose(0, 2, 1, 3).reshape(-1, n_tile_cols * tile_size)[:height, :width].
+
+        Returns:
+            (np.memmap): tile-major array of counts, padded to whole tiles.
+        """
+        return self.grid
+
+    def _remap(self):
+        """Flushes the grid and maps the file again, releasing pages of tiles already written.
+        """
+        self.grid.flush()
+        self.grid = np.load(self.filename, mmap_mode="r+")
+
+    def close(self):
+        """Flushes the grid to disk, and removes it if it was stored in a temp file.
+        """
+        if self.grid is None:
+            return
+
+        self.grid.flush()
+        self.grid = None
+        if self.temp_dir is not None:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _iter_line_tiles(self, start_coord, end_coord):
+        """Walks a horizontal, vertical, or 45 degree diagonal line tile by tile.
+
+        Args:
+            start_coord (tuple of int): tuple of int representing start x, y coords.
+            end_coord (tuple of int): tuple of int representing end x, y coords.
+
+        Yields:
+            (tuple of int): (tile row, tile col) of each tile the line crosses.
+        """
+        x_step = (end_coord[0] > start_coord[0]) - (end_coord[0] < start_coord[0])
+        y_step = (end_coord[1] > start_coord[1]) - (end_coord[1] < start_coord[1])
+        n_steps = max(abs(end_coord[0] - start_coord[0]), abs(end_coord[1] - start_coord[1]))
+
+        step = 0
+        while step <= n_steps:
+            x_coord = start_coord[0] + step * x_step
+            y_coord = start_coord[1] + step * y_step
+            yield y_coord // self.tile_size, x_coord // self.tile_size
+
+            # jump to the first step past the edge of the current tile, in either direction
+            steps_in_tile = n_steps - step
+            for coord, coord_step in ((x_coord, x_step), (y_coord, y_step)):
+                if coord_step > 0:
+                    steps_in_tile = min(steps_in_tile, self.tile_size - 1 - coord % self.tile_size)
+                elif coord_step < 0:
+                    steps_in_tile = min(steps_in_tile, coord % self.tile_size)
+            step += steps_in_tile + 1
+
+    def _bucket_segments(self, segments, include_diagonal):
+        """Assigns each segment to every tile that it crosses.
+
+        Args:
+            segments (list of tuple of 2 tuples): start and end (x, y) coords for each line.
+            include_diagonal (boolean): whether diagonal lines should be considered.
+
+        Returns:
+            (dict): (tile row, tile col): list of segments that cross the tile.
+
+        Raises:
+            ValueError: if a segment is outside of the grid.
+        """
+        tile_segments = {}
+        for start_coord, end_coord in segments:
+            for x_coord, y_coord in (start_coord, end_coord):
+                if not (0 <= x_coord < self.width and 0 <= y_coord < self.height):
+                    raise ValueError(f"Segment {start_coord} -> {end_coord} is outside of the "
+                                     f"{self.width}x{self.height} grid.")
+
+            is_vertical = start_coord[0] == end_coord[0]
+            is_horizontal = start_coord[1] == end_coord[1]
+            if not is_vertical and not is_horizontal and not include_diagonal:
+                continue
+
+            for tile_key in self._iter_line_tiles(start_coord, end_coord):
+                tile_segments.setdefault(tile_key, []).append((start_coord, end_coord))
+
+        return tile_segments
+
+    def iter_tile_overlaps(self, segments, include_diagonal=True):
+        """Rasterizes segments onto the grid tile by tile.
+
+        Args:
+            segments (list of tuple of 2 tuples): start and end (x, y) coords for each line.
+            include_diagonal (boolean): whether diagonal lines should be considered.
+
+        Yields:
+            (tuple of int, int): (tile row, tile col) of each tile the segments cross, and count
+                of cells in the whole tile where 2+ lines overlap, including earlier calls.
+
+        Raises:
+            ValueError: if a segment is outside of the grid.
+        """
+        tile_segments = self._bucket_segments(segments, include_diagonal)
+
+        for (tile_row, tile_col), curr_segments in sorted(tile_segments.items()):
+            y_start = tile_row * self.tile_size
+            x_start = tile_col * self.tile_size
+            y_end = y_start + self.tile_size
+            x_end = x_start + self.tile_size
+
+            # accumulate into an in-memory copy of the tile, then write it back once
+            tile = np.array(self.grid[tile_row, tile_col])
+            prev_tile_overlaps = int(np.count_nonzero(tile >= 2))
+            for start_coord, end_coord in curr_segments:
+                x_coords, y_coords = clip_line_to_tile(start_coord, end_coord,
+                                                       (x_start, y_start, x_end, y_end))
+
+                # cells on a single line are unique, so a fancy-indexed add is safe
+                cells = (y_coords - y_start, x_coords - x_start)
+                curr_counts = tile[cells]
+                tile[cells] = curr_counts + (curr_counts < self.max_count)
+
+            self.grid[tile_row, tile_col] = tile
+            self._remap()
+            tile_overlaps = int(np.count_nonzero(tile >= 2))
+            self.n_overlaps += tile_overlaps - prev_tile_overlaps
+            yield (tile_row, tile_col), tile_overlaps
+
+    def rasterize(self, segments, include_diagonal=True):
+        """Rasterizes segments onto the grid and counts the cells where 2+ lines overlap.
+
+        Args:
+            segments (list of tuple of 2 tuples): start and end (x, y) coords for each line.
+            include_diagonal (boolean): whether diagonal lines should be considered.
+
+        Returns:
+            (int): count of locations on the whole grid where 2+ lines overlap, including
+                segments from earlier calls.
+
+        Raises:
+            ValueError: if a segment is outside of the grid.
+        """
+        for _ in self.iter_tile_overlaps(segments, include_diagonal):
+            pass
+
+        return self.n_overlaps
+
+
+def rasterize_band(grid_name, segments_name, n_segments, width, band_rows,
+                   include_diagonal, chunk_cells=1 << 20):
+    """Rasterizes every segment clipped to a horizontal band of a grid in shared memory.
+    Counts are accumulated straight into the shared uint8 band, saturating at 255.
+
+    Args:
+        grid_name (string): name of shared memory block holding the uint8 grid.
+        segments_name (string): name of shared memory block holding an (n, 4) int64 array
+            of start x, start y, end x, end y for each segment.
+        n_segments (int): number of segments.
+        width (int): number of columns in the grid.
+        band_rows (tuple of int): first row and end row (exclusive) of the band.
+        include_diagonal (boolean): whether diagonal lines should be considered.
+        chunk_cells (int): max number of line cells to rasterize at a time, to bound memory.
+
+    Returns:
+        (int): count of locations in the band where 2+ lines overlap.
+    """
+    band_start, band_end = band_rows
+    max_count = np.iinfo(np.uint8).max
+    grid_memory = shared_memory.SharedMemory(name=grid_name)
+    segments_memory = shared_memory.SharedMemory(name=segments_name)
+    try:
+        segments = np.ndarray((n_segments, 4), dtype=np.int64, buffer=segments_memory.buf)
+        band = np.ndarray((band_end - band_start, width), dtype=np.uint8, buffer=grid_memory.buf,
+                          offset=band_start * width)
+        band_cells = band.reshape(-1)
+
+        start_x, start_y, end_x, end_y = segments.T
+        x_step = np.sign(end_x - start_x)
+        y_step = np.sign(end_y - start_y)
+        n_steps = np.maximum(np.abs(end_x - start_x), np.abs(end_y - start_y))
+
+        # find the range of steps along each line that falls within the band
+        first_step = np.where(y_step > 0, band_start - start_y,
+                              np.where(y_step < 0, start_y - (band_end - 1), 0))
+        last_step = np.where(y_step > 0, band_end - 1 - start_y,
+                             np.where(y_step < 0, start_y - band_start, n_steps))
+        first_step = np.maximum(first_step, 0)
+        last_step = np.minimum(last_step, n_steps)
+
+        # horizontal lines are either fully inside or outside the band
+        outside_band = (y_step == 0) & ((start_y < band_start) | (start_y >= band_end))
+        is_diagonal = (x_step != 0) & (y_step != 0)
+        skip_line = outside_band | (is_diagonal & (not include_diagonal))
+        n_cells = np.where(skip_line, 0, np.maximum(last_step - first_step + 1, 0))
+        cells_end = np.cumsum(n_cells)
+        total_cells = int(cells_end[-1]) if n_segments > 0 else 0
+
+        # expand clipped lines into cells a chunk at a time, where long lines can span chunks
+        for chunk_start in range(0, total_cells, chunk_cells):
+            cell_ids = np.arange(chunk_start, min(chunk_start + chunk_cells, total_cells))
+            line_index = np.searchsorted(cells_end, cell_ids, side="right")
+            steps = first_step[line_index] + cell_ids - (cells_end - n_cells)[line_index]
+            x_coords = start_x[line_index] + steps * x_step[line_index]
+            y_coords = start_y[line_index] + steps * y_step[line_index]
+
+            # add to the shared band, saturating instead of wrapping around
+            cell_positions, cell_counts = np.unique((y_coords - band_start) * width + x_coords,
+                                                    return_counts=True)
+            band_cells[cell_positions] = np.minimum(
+                band_cells[cell_positions].astype(np.int64) + cell_counts, max_count)
+
+        # count a few rows at a time to avoid a band-sized temporary
+        rows_per_count = max(1, chunk_cells // max(width, 1))
+        return sum(int(np.count_nonzero(band[row:row + rows_per_count] >= 2))
+                   for row in range(0, len(band), rows_per_count))
+    finally:
+        grid_memory.close()
+        segments_memory.close()
+
+
+def count_overlaps_parallel(segments, include_diagonal=True, n_workers=None, bands_per_worker=4):
+    """Counts locations where 2+ lines overlap by rasterizing horizontal bands in parallel.
+    The grid and segments are placed in shared memory, and each worker writes its band in place.
+
+    Args:
+        segments (list of tuple of 2 tuples): start and end (x, y) coords for each line.
+        include_diagonal (boolean): whether diagonal lines should be considered.
+        n_workers (int, optional): number of worker processes. Uses the CPU count if None.
+        bands_per_worker (int): number of bands per worker, to balance uneven bands.
+
+    Returns:
+        (int): count of locations where 2+ lines overlap.
+    """
+    if len(segments) == 0:
+        return 0
+
+    n_workers = n_workers or os.cpu_count() or 1
+    segment_array = np.array([(*start, *end) for start, end in segments], dtype=np.int64)
+    width = int(segment_array[:, [0, 2]].max()) + 1
+    height = int(segment_array[:, [1, 3]].max()) + 1
+
+    grid_memory = shared_memory.SharedMemory(create=True, size=width * height)
+    segments_memory = shared_memory.SharedMemory(create=True, size=segment_array.nbytes)
+    try:
+        np.ndarray(segment_array.shape, dtype=np.int64, buffer=segments_memory.buf)[:] = \
+            segment_array
+
+        # split rows into evenly sized bands
+        n_bands = min(height, n_workers * bands_per_worker)
+        band_edges = [height * band_index // n_bands for band_index in range(n_bands + 1)]
+        band_rows = list(zip(band_edges[:-1], band_edges[1:]))
+
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            band_overlaps = executor.map(
+                rasterize_band, *zip(*[(grid_memory.name, segments_memory.name,
+                                        len(segment_array), width, rows, include_diagonal)
+                                       for rows in band_rows]))
+            return sum(band_overlaps)
+    finally:
+        grid_memory.close()
+        grid_memory.unlink()
+        segments_memory.close()
+        segments_memory.unlink()
+
+
 def day5_pt1(input_file):
     """Determines the number of spots on the ocean floor where 2+ lines overlap.
     Only considers vertical or horizontal lines.
@@ -5,9 +5,13 @@ For more information, see: https://adventofcode.com/2021/day/6.
 
 import sys
 import os
+import math
+
+import numpy as np
 
 sys.path.append("..")
 import utils.read_input as read_input
+import utils.lru_cache as lru_cache
 
 
 def parse_input(input_list):
@@ -61,6 +65,269 @@ def simulate_fish_population(input_fishes, n_days):
     return sum(fish_dict.values())
 
 
+def count_fish_timers(input_fishes, reset_timer, spawn_timer):
+    """Counts fishes by timer, for timers from 0 up to the larger of reset_timer and spawn_timer.
+
+    Args:
+        input_fishes (list of int): list of fishes with their initial timers.
+        reset_timer (int): timer a fish resets to after spawning a new fish.
+        spawn_timer (int): timer that a newly spawned fish starts with.
+
+    Returns:
+        (list of int): number of fishes with each timer.
+    """
+    if reset_timer < 0 or spawn_timer < 0:
+        raise ValueError("reset_timer and spawn_timer must be non-negative.")
+
+    n_timers = max(reset_timer, spawn_timer) + 1
+    timer_counts = [0] * n_timers
+    for curr_fish in input_fishes:
+        if curr_fish < 0 or curr_fish >= n_timers:
+            raise ValueError(f"Fish timer {curr_fish} is outside of [0, {n_timers - 1}].")
+        timer_counts[curr_fish] += 1
+
+    return timer_counts
+
+
+class LanternfishModel:
+    """Population model for lanternfish with configurable reset and spawn timers.
+    Counts are stored in a fixed-size ring buffer indexed by timer, where advancing a day
+    only rotates an offset instead of rebuilding the counts.
+    """
+    def __init__(self, input_fishes, reset_timer=6, spawn_timer=8):
+        """Constructor
+
+        Args:
+            input_fishes (list of int): list of fishes with their initial timers.
+            reset_timer (int): timer a fish resets to after spawning a new fish.
+            spawn_timer (int): timer that a newly spawned fish starts with.
+        """
+        self.reset_timer = reset_timer
+        self.spawn_timer = spawn_timer
+        self.day = 0
+
+        # store counts for each timer, where index (offset + timer) % n_timers holds timer
+        self.timer_counts = count_fish_timers(input_fishes, reset_timer, spawn_timer)
+        self.n_timers = len(self.timer_counts)
+        self.offset = 0
+
+        # keep a running total so the population doesn't need to be summed each day
+        self.population = len(input_fishes)
+
+    def count_for_timer(self, timer):
+        """Gets the number of fishes with a given timer.
+
+        Args:
+            timer (int): timer to get the count for.
+
+        Returns:
+            (int): number of fishes with the timer.
+        """
+        return self.timer_counts[(self.offset + timer) % self.n_timers]
+
+    def step(self):
+        """Advances the simulation by a single day.
+
+        Returns:
+            (int): total number of fishes after the day.
+        """
+        # fishes at timer 0 are the ones that spawn today
+        spawning_count = self.timer_counts[self.offset]
+
+        # rotating the offset decrements all timers by 1, and moves the timer 0 slot to the end
+        self.offset = (self.offset + 1) % self.n_timers
+        last_timer = self.n_timers - 1
+
+        # the rotated slot now holds timer n_timers - 1, move counts to spawn and reset timers
+        if self.spawn_timer != last_timer:
+            self.timer_counts[(self.offset + last_timer) % self.n_timers] -= spawning_count
+            self.timer_counts[(self.offset + self.spawn_timer) % self.n_timers] += spawning_count
+        self.timer_counts[(self.offset + self.reset_timer) % self.n_timers] += spawning_count
+
+        # every spawning fish adds exactly one new fish
+        self.population += spawning_count
+        self.day += 1
+
+        return self.population
+
+    def population_by_day(self, n_days=None):
+        """Generator that simulates the population day by day.
+
+        Args:
+            n_days (int, optional): number of days to simulate. Runs forever if None.
+
+        Yields:
+            (int): total number of fishes after each simulated day.
+        """
+        simulated_days = 0
+        while n_days is None or simulated_days < n_days:
+            yield self.step()
+            simulated_days += 1
+
+
+def multiply_matrices(left, right, modulus=None):
+    """Multiplies two square matrices of ints.
+
+    Args:
+        left (list of list of int): left matrix.
+        right (list of list of int): right matrix.
+        modulus (int, optional): modulus to reduce each entry by, if any.
+
+    Returns:
+        (list of list of int): product of left and right.
+    """
+    right_cols = list(zip(*right))
+    product = [[sum(a * b for a, b in zip(row, col)) for col in right_cols] for row in left]
+    if modulus is not None:
+        product = [[val % modulus for val in row] for row in product]
+
+    return product
+
+
+class LanternfishQuery:
+    """Answers population questions for a fixed starting population at any number of days.
+    Each day is a linear transition on the timer counts, so populations are computed from powers
+    of the transition matrix, which are cached by exponent in a bounded LRU cache.
+    Populations can be exact, modulo a number (such as a large prime) to keep ints small, or
+    estimated on a log scale from the dominant eigenvalue of the transition matrix.
+    """
+    OUTPUT_MODES = ("exact", "modular", "log10")
+
+    def __init__(self, input_fishes, reset_timer=6, spawn_timer=8, cache_size=128,
+                 exact_log_days=1000):
+        """Constructor
+
+        Args:
+            input_fishes (list of int): list of fishes with their initial timers.
+            reset_timer (int): timer a fish resets to after spawning a new fish.
+            spawn_timer (int): timer that a newly spawned fish starts with.
+            cache_size (int): max number of cached matrix powers and answers.
+            exact_log_days (int): horizons up to this many days are computed exactly in log10
+                mode, and only longer ones are estimated.
+        """
+        self.exact_log_days = exact_log_days
+        self.cache = lru_cache.LRUCache(cache_size)
+        self.timer_counts = count_fish_timers(input_fishes, reset_timer, spawn_timer)
+        self.n_timers = len(self.timer_counts)
+
+        # transition[i][j] is how many fish with timer i one fish with timer j becomes in a day
+        self.transition = [[0] * self.n_timers for _ in range(self.n_timers)]
+        for timer in range(1, self.n_timers):
+            self.transition[timer - 1][timer] = 1
+        self.transition[reset_timer][0] += 1
+        self.transition[spawn_timer][0] += 1
+
+    def matrix_power(self, exponent, modulus=None):
+        """Gets the transition matrix raised to a power, built from cached powers of two.
+
+        Args:
+            exponent (int): number of days to transition.
+            modulus (int, optional): modulus to reduce each entry by, if any.
+
+        Returns:
+            (list of list of int): transition matrix for exponent days.
+        """
+        def compute_power():
+            if exponent == 0:
+                return [[int(row == col) for col in range(self.n_timers)]
+                        for row in range(self.n_timers)]
+            if exponent == 1:
+                if modulus is None:
+                    return self.transition
+                return [[val % modulus for val in row] for row in self.transition]
+
+            # split into the highest power of two and the remainder, e.g. 13 = 8 + 5
+            highest_bit = 1 << (exponent.bit_length() - 1)
+            if highest_bit == exponent:
+                half_power = self.matrix_power(exponent // 2, modulus)
+                return multiply_matrices(half_power, half_power, modulus)
+
+            return multiply_matrices(self.matrix_power(highest_bit, modulus),
+                                     self.matrix_power(exponent - highest_bit, modulus), modulus)
+
+        return self.cache.get_or_compute(("matrix_power", exponent, modulus), compute_power)
+
+    def dominant_eigen(self):
+        """Gets the dominant eigenvalue of the transition matrix, and the constant that the
+        population approaches when divided by the eigenvalue raised to the number of days.
+        Assumes a single dominant eigenvalue, which holds for the default timers.
+
+        Returns:
+            (float): dominant eigenvalue.
+            (float): population / eigenvalue^n_days as n_days grows.
+        """
+        def compute_eigen():
+            transition = np.array(self.transition, dtype=np.float64)
+            eigenvalues, right_vectors = np.linalg.eig(transition)
+            left_eigenvalues, left_vectors = np.linalg.eig(transition.T)
+
+            # transition^n approaches eigenvalue^n * right_vector * left_vector^T / (left . right)
+            dominant_index = np.argmax(eigenvalues.real)
+            right_vector = right_vectors[:, dominant_index].real
+            left_vector = left_vectors[:, np.argmax(left_eigenvalues.real)].real
+
+            constant = (right_vector.sum() * (left_vector @ np.array(self.timer_counts))
+                        / (left_vector @ right_vector))
+            return float(eigenvalues[dominant_index].real), float(constant)
+
+        return self.cache.get_or_compute("dominant_eigen", compute_eigen)
+
+    def population(self, n_days, mode="exact", modulus=None):
+        """Counts the number of fish after n_days.
+
+        Args:
+            n_days (int): number of days to simulate.
+            mode (string): "exact" for the full int, "modular" for the count modulo modulus,
+                or "log10" for the base 10 log of the count, which is estimated from the
+                dominant eigenvalue for horizons over exact_log_days.
+            modulus (int, optional): modulus for "modular" mode, such as a large prime.
+
+        Returns:
+            (int or float): total number of fishes after n_days, in the requested mode.
+        """
+        if mode not in self.OUTPUT_MODES:
+            raise ValueError(f"Unknown output mode: {mode}")
+        if (mode == "modular") != (modulus is not None):
+            raise ValueError("A modulus must be given for modular mode, and only for it.")
+        if modulus is not None and modulus < 2:
+            raise ValueError(f"Modulus must be at least 2, got {modulus}.")
+        if n_days < 0:
+            raise ValueError(f"Number of days must be non-negative, got {n_days}.")
+
+        def compute_population():
+            # small horizons stay exact, even on a log scale
+            if mode == "log10" and n_days <= self.exact_log_days:
+                exact_population = self.population(n_days)
+                return math.log10(exact_population) if exact_population > 0 else -math.inf
+
+            if mode == "log10":
+                eigenvalue, constant = self.dominant_eigen()
+                if constant <= 0:
+                    return -math.inf
+                return n_days * math.log10(eigenvalue) + math.log10(constant)
+
+            # apply the cached power of two matrix for each bit of n_days to the timer counts,
+            # which avoids multiplying whole matrices for each new horizon
+            timer_counts = self.timer_counts
+            remaining_days = n_days
+            bit_index = 0
+            while remaining_days > 0:
+                if remaining_days & 1:
+                    power = self.matrix_power(1 << bit_index, modulus)
+                    timer_counts = [sum(a * b for a, b in zip(row, timer_counts))
+                                    for row in power]
+                    if modulus is not None:
+                        timer_counts = [count % modulus for count in timer_counts]
+                remaining_days >>= 1
+                bit_index += 1
+
+            population = sum(timer_counts)
+            return population if modulus is None else population % modulus
+
+        return self.cache.get_or_compute(("population", n_days, mode, modulus),
+                                         compute_population)
+
+
 def day6_pt1(input_file):
     """Simulates fish population over 80 days.
 
@@ -4,11 +4,16 @@ For more information, see: https://adventofcode.com/2021/day/7.
 """
 from statistics import mean
 from math import inf
+from bisect import bisect_right
+from functools import partial
 import sys
 import os
 
+import numpy as np
+
 sys.path.append("..")
 import utils.read_input as read_input
+import utils.lru_cache as lru_cache
 
 
 def parse_input(input_list):
@@ -23,6 +28,236 @@ def parse_input(input_list):
     return [int(x) for x in input_list[0].split(",")]
 
 
+class FuelModel:
+    """Cost plugin for aligning crabs, mapping the distance each crab moves to its fuel cost.
+    Models flagged as convex are minimized with a ternary search, and all others are scanned.
+    """
+    def __init__(self, name, cost_fn, is_convex):
+        """Constructor
+
+        Args:
+            name (string): name of fuel model.
+            cost_fn (function): takes an np.ndarray of non-negative distances and returns
+                an np.ndarray of costs. Must be non-decreasing in distance if is_convex.
+            is_convex (boolean): whether cost_fn is convex and non-decreasing in distance,
+                which makes the total cost convex in the target position.
+        """
+        self.name = name
+        self.cost_fn = cost_fn
+        self.is_convex = is_convex
+
+
+LINEAR_FUEL = FuelModel("linear", lambda distances: distances, True)
+TRIANGULAR_FUEL = FuelModel("triangular", lambda distances: distances * (distances + 1) // 2, True)
+QUADRATIC_FUEL = FuelModel("quadratic", lambda distances: distances * distances, True)
+
+
+def capped_fuel_model(base_model, max_cost):
+    """Creates a fuel model where no crab spends more than max_cost.
+    Capping makes the cost concave past the cap, so the model is not convex.
+
+    Args:
+        base_model (FuelModel): fuel model to cap.
+        max_cost (int): max fuel any crab spends.
+
+    Returns:
+        FuelModel: capped fuel model.
+    """
+    return FuelModel(f"capped_{base_model.name}",
+                     lambda distances: np.minimum(base_model.cost_fn(distances), max_cost), False)
+
+
+class AlignmentEngine:
+    """Finds the cheapest position to align crabs on for any fuel model.
+    Crabs are stored as a histogram of distinct positions with (optionally weighted) counts, so
+    each candidate target is evaluated with one vectorized sum over distinct positions.
+    """
+    def __init__(self, positions, weights=None):
+        """Constructor
+
+        Args:
+            positions (list of int): position of each crab.
+            weights (list of number, optional): weight of each crab. Every crab counts once if None.
+        """
+        self.positions, crab_positions = np.unique(np.asarray(positions, dtype=np.int64),
+                                                   return_inverse=True)
+        self.weights = np.bincount(crab_positions, weights=weights,
+                                   minlength=len(self.positions))
+        if weights is None:
+            self.weights = self.weights.astype(np.int64)
+
+    def cost(self, target_pos, fuel_model):
+        """Computes the cost to align all crabs on a target position.
+
+        Args:
+            target_pos (int): position to align crabs to.
+            fuel_model (FuelModel): cost of moving each crab.
+
+        Returns:
+            (number): cost to align all crabs.
+        """
+        distances = np.abs(self.positions - target_pos)
+        return (self.weights * fuel_model.cost_fn(distances)).sum().item()
+
+    def min_cost(self, fuel_model, cost_fn=None):
+        """Computes the minimum cost to align crabs on any position between the outermost crabs.
+
+        Args:
+            fuel_model (FuelModel): cost of moving each crab.
+            cost_fn (function, optional): takes a target position and returns the same cost as
+                cost, such as a closed form for fuel_model. Uses cost if None.
+
+        Returns:
+            (int): position with the minimum cost, lowest if tied.
+            (number): minimum cost to align all crabs.
+        """
+        if cost_fn is None:
+            cost_fn = partial(self.cost, fuel_model=fuel_model)
+
+        lower_pos = int(self.positions[0])
+        upper_pos = int(self.positions[-1])
+
+        # ternary search narrows the range for convex costs, keeping the minimum in [lower, upper]
+        if fuel_model.is_convex:
+            while upper_pos - lower_pos > 2:
+                left_pos = lower_pos + (upper_pos - lower_pos) // 3
+                right_pos = upper_pos - (upper_pos - lower_pos) // 3
+                left_cost = cost_fn(left_pos)
+                right_cost = cost_fn(right_pos)
+
+                if left_cost < right_cost:
+                    upper_pos = right_pos - 1
+                elif left_cost > right_cost:
+                    lower_pos = left_pos + 1
+                else:
+                    lower_pos, upper_pos = left_pos, right_pos
+
+        # scan whatever range is left, which is every position for non-convex costs
+        min_pos, min_cost = None, inf
+        for target_pos in range(lower_pos, upper_pos + 1):
+            curr_cost = cost_fn(target_pos)
+            if curr_cost < min_cost:
+                min_pos, min_cost = target_pos, curr_cost
+
+        # ties on equal costs can leave the search on the inside of a flat minimum, so binary
+        # search left for where it starts, since convex costs don't increase up to the minimum
+        if fuel_model.is_convex:
+            lower_pos = int(self.positions[0])
+            while lower_pos < min_pos:
+                mid_pos = (lower_pos + min_pos) // 2
+                if cost_fn(mid_pos) == min_cost:
+                    min_pos = mid_pos
+                else:
+                    lower_pos = mid_pos + 1
+
+        return min_pos, min_cost
+
+
+class CrabAlignmentQuery:
+    """Answers alignment cost questions for a fixed list of crab positions at any target.
+    Positions are stored as a histogram with prefix counts, sums, and sums of squares, so the cost
+    at a target is O(log n) for the linear, triangular, and quadratic fuel models. Other fuel
+    models, and the search for the minimum, are left to an AlignmentEngine over the same crabs.
+    Intermediates and answers are cached in a bounded LRU cache.
+    """
+    def __init__(self, positions, cache_size=128):
+        """Constructor
+
+        Args:
+            positions (list of int): position of each crab.
+            cache_size (int): max number of cached intermediates and answers.
+        """
+        self.engine = AlignmentEngine(positions)
+        self.cache = lru_cache.LRUCache(cache_size)
+
+    def histogram(self):
+        """Gets the sorted distinct positions with prefix sums over them.
+
+        Returns:
+            (list of int): sorted distinct positions.
+            (list of int): prefix counts of crabs, where index i covers the first i positions.
+            (list of int): prefix sums of positions.
+            (list of int): prefix sums of squared positions.
+        """
+        def compute_histogram():
+            # sums are kept as python ints, so they can't overflow
+            distinct_positions = self.engine.positions.tolist()
+            prefix_counts = [0]
+            prefix_sums = [0]
+            prefix_squares = [0]
+            for position, count in zip(distinct_positions, self.engine.weights.tolist()):
+                prefix_counts.append(prefix_counts[-1] + count)
+                prefix_sums.append(prefix_sums[-1] + count * position)
+                prefix_squares.append(prefix_squares[-1] + count * position * position)
+
+            return distinct_positions, prefix_counts, prefix_sums, prefix_squares
+
+        return self.cache.get_or_compute("histogram", compute_histogram)
+
+    def compute_cost(self, target_pos, fuel_model):
+        """Computes the cost to align all crabs on a target position, without caching it.
+
+        Args:
+            target_pos (int): position to align crabs to.
+            fuel_model (FuelModel): cost of moving each crab.
+
+        Returns:
+            (number): cost to align all crabs.
+        """
+        if fuel_model not in (LINEAR_FUEL, TRIANGULAR_FUEL, QUADRATIC_FUEL):
+            return self.engine.cost(target_pos, fuel_model)
+
+        distinct_positions, prefix_counts, prefix_sums, prefix_squares = self.histogram()
+
+        # split crabs into those at or left of the target, and those right of it
+        split = bisect_right(distinct_positions, target_pos)
+        left_count, left_sum = prefix_counts[split], prefix_sums[split]
+        right_count = prefix_counts[-1] - left_count
+        right_sum = prefix_sums[-1] - left_sum
+
+        # sum of |x - target| over all crabs
+        linear_cost = (target_pos * left_count - left_sum) + (right_sum - target_pos * right_count)
+        if fuel_model is LINEAR_FUEL:
+            return linear_cost
+
+        # sum of (x - target)^2 over all crabs
+        squared_cost = (prefix_counts[-1] * target_pos * target_pos
+                        - 2 * target_pos * prefix_sums[-1] + prefix_squares[-1])
+        if fuel_model is QUADRATIC_FUEL:
+            return squared_cost
+
+        # sum of d * (d + 1) / 2 = (sum of d^2 + sum of d) / 2
+        return (squared_cost + linear_cost) // 2
+
+    def cost(self, target_pos, fuel_model=TRIANGULAR_FUEL):
+        """Gets the cost to align all crabs on a target position.
+
+        Args:
+            target_pos (int): position to align crabs to.
+            fuel_model (FuelModel): cost of moving each crab.
+
+        Returns:
+            (number): cost to align all crabs.
+        """
+        return self.cache.get_or_compute(("cost", fuel_model, target_pos),
+                                         lambda: self.compute_cost(target_pos, fuel_model))
+
+    def min_cost(self, fuel_model=TRIANGULAR_FUEL):
+        """Computes the minimum cost to align crabs on any position between the outermost crabs.
+
+        Args:
+            fuel_model (FuelModel): cost of moving each crab.
+
+        Returns:
+            (number): minimum cost to align all crabs.
+        """
+        # costs are computed directly so a search doesn't flush the cache
+        return self.cache.get_or_compute(
+            ("min_cost", fuel_model),
+            lambda: self.engine.min_cost(
+                fuel_model, lambda target_pos: self.compute_cost(target_pos, fuel_model))[1])
+
+
 def day7_pt1(input_file):
     """Computes the minimum cost to align crabs on a single point.
     Cost function is linear with the shift each crab needs to make to the target position.
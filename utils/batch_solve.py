@@ -0,0 +1,142 @@
+"""
+This module is used to solve many input files for a day of Advent of Code in a single process.
+The day's module is imported once (per worker), and results are written as JSONL lines as each
+input completes.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import argparse
+import json
+import sys
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent))
+import load_day
+
+
+def get_input_files(input_source):
+    """Gets the list of input files from a directory or a manifest file.
+
+    Args:
+        input_source (string): directory of .txt input files, or manifest file listing one
+            input path per line. Relative paths in a manifest are resolved against its directory.
+
+    Returns:
+        [Path]: list of input files to solve.
+    """
+    input_source = Path(input_source)
+    if input_source.is_dir():
+        return sorted(input_source.glob("*.txt"))
+
+    input_files = []
+    with open(input_source, "r", encoding="utf-8") as manifest_file:
+        for line in manifest_file:
+            line = line.strip()
+
+            # skip blank lines and comments
+            if line == "" or line.startswith("#"):
+                continue
+
+            input_files.append((input_source.parent / line).resolve())
+
+    return input_files
+
+
+def solve_input(day_num, input_file, parts):
+    """Solves the requested parts of a day for a single input file.
+
+    Args:
+        day_num (int): number for the day.
+        input_file (string): filename to solve.
+        parts ([int]): part numbers to solve.
+
+    Returns:
+        (dict): result record with answers, elapsed seconds, and any error for each part.
+    """
+    solvers = load_day.get_part_solvers(day_num)
+    record = {"day": day_num, "input": str(input_file)}
+
+    for part_num in parts:
+        start_time = time.perf_counter()
+        try:
+            record[f"part{part_num}"] = solvers[part_num](str(input_file))
+        except Exception as error:  # pylint: disable=broad-except
+            record[f"part{part_num}_error"] = f"{type(error).__name__}: {error}"
+        record[f"part{part_num}_seconds"] = time.perf_counter() - start_time
+
+    return record
+
+
+def iter_batch_results(day_num, input_files, parts=(1, 2), n_workers=1):
+    """Solves a day for many input files, reusing a warm process (or pool of processes).
+
+    Args:
+        day_num (int): number for the day.
+        input_files ([string]): filenames to solve.
+        parts ([int]): part numbers to solve.
+        n_workers (int): number of worker processes. Solves in the current process if 1.
+
+    Yields:
+        (dict): result record for each input, in order of completion.
+    """
+    # load module up front so a missing day fails before any work is done
+    solvers = load_day.get_part_solvers(day_num)
+    missing_parts = [part_num for part_num in parts if part_num not in solvers]
+    if len(missing_parts) > 0:
+        raise ValueError(f"Day {day_num} has no solver for parts {missing_parts}.")
+
+    if n_workers <= 1:
+        for input_file in input_files:
+            yield solve_input(day_num, input_file, parts)
+        return
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=load_day.get_part_solvers,
+                             initargs=(day_num,)) as executor:
+        futures = [executor.submit(solve_input, day_num, input_file, parts)
+                   for input_file in input_files]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(day_num, input_source, output_file, parts, n_workers):
+    """Solves all inputs for a day and writes a JSONL record for each as it completes.
+
+    Args:
+        day_num (int): number for the day.
+        input_source (string): directory of input files or manifest file.
+        output_file (string): JSONL file to write results to. Writes to stdout if None.
+        parts ([int]): part numbers to solve.
+        n_workers (int): number of worker processes.
+    """
+    input_files = get_input_files(input_source)
+
+    output_stream = sys.stdout
+    if output_file is not None:
+        output_stream = open(output_file, "w", encoding="utf-8")
+
+    try:
+        for record in iter_batch_results(day_num, input_files, parts, n_workers):
+            output_stream.write(json.dumps(record) + "\n")
+            output_stream.flush()
+    finally:
+        if output_file is not None:
+            output_stream.close()
+
+
+if __name__ == "__main__":
+    # create argument parser
+    parser = argparse.ArgumentParser(
+        description="Solves many input files for a day of Advent of Code in one process.")
+    parser.add_argument("day_num", type=int, help="Number of day.")
+    parser.add_argument("input_source", type=str,
+                        help="Directory of .txt input files, or manifest listing input paths.")
+    parser.add_argument("-o", "--output", type=str, default=None,
+                        help="JSONL file to write results to. Defaults to stdout.")
+    parser.add_argument("-p", "--parts", type=int, nargs="+", default=[1, 2],
+                        help="Parts to solve.")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="Number of worker processes.")
+
+    # parse args and call main
+    args = parser.parse_args()
+    main(args.day_num, args.input_source, args.output, args.parts, args.workers)
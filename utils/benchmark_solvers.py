@@ -0,0 +1,308 @@
+"""
+This module provides timing and memory benchmarks for Advent of Code solutions.
+Each solver runs on generated inputs of several sizes in a fresh process, recording wall time,
+tracemalloc peak, blocks still allocated when it returns, and how much the solver grows peak RSS
+over the RSS before it runs. Results can be stored as a baseline, and later runs fail when memory
+use or allocations grow beyond a threshold over the baseline.
+"""
+from pathlib import Path
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.append(str(Path(__file__).resolve().parent))
+import load_day
+
+
+def generate_benchmark_input(day_num, scale, rng):
+    """Generates a puzzle-like input for a day, with size proportional to scale.
+
+    Args:
+        day_num (int): number for the day.
+        scale (int): size multiplier, where 1 is about the size of a puzzle input.
+        rng (random.Random): random number generator.
+
+    Returns:
+        string: content for an input file.
+    """
+    if day_num == 1:
+        return "\n".join(str(rng.randint(0, 10000)) for _ in range(2000 * scale))
+
+    if day_num == 2:
+        return "\n".join(f"{rng.choice(['forward', 'down', 'up'])} {rng.randint(1, 9)}"
+                         for _ in range(1000 * scale))
+
+    if day_num == 3:
+        # every number of n_bits, so the rating filters never run out of rows
+        n_bits = (1024 * scale - 1).bit_length()
+        rows = list(range(2 ** n_bits))
+        rng.shuffle(rows)
+        return "\n".join(f"{row:0{n_bits}b}" for row in rows)
+
+    if day_num == 4:
+        drawn_numbers = list(range(100))
+        rng.shuffle(drawn_numbers)
+        board_strs = []
+        for _ in range(100 * scale):
+            board = rng.sample(range(100), 25)
+            board_strs.append("\n".join(" ".join(f"{num:2}" for num in board[row * 5:row * 5 + 5])
+                                        for row in range(5)))
+        return ",".join(str(num) for num in drawn_numbers) + "\n\n" + "\n\n".join(board_strs)
+
+    if day_num == 5:
+        segments = []
+        for _ in range(500 * scale):
+            start_x, start_y = rng.randint(0, 999), rng.randint(0, 999)
+            length = rng.randint(0, 999 - max(start_x, start_y))
+            end_x, end_y = rng.choice([(start_x + length, start_y), (start_x, start_y + length),
+                                       (start_x + length, start_y + length)])
+            segments.append(f"{start_x},{start_y} -> {end_x},{end_y}")
+        return "\n".join(segments)
+
+    if day_num == 6:
+        return ",".join(str(rng.randint(1, 5)) for _ in range(300 * scale))
+
+    if day_num == 7:
+        return ",".join(str(rng.randint(0, 500)) for _ in range(100 * scale))
+
+    raise ValueError(f"No benchmark input generator for day {day_num}.")
+
+
+def get_current_rss_kb():
+    """Gets the current resident set size of this process.
+
+    Returns:
+        (int): current RSS in KB.
+    """
+    with open("/proc/self/statm", "r", encoding="utf-8") as statm_file:
+        resident_pages = int(statm_file.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def measure_peak_rss_kb(run_fn, sample_interval=0.001):
+    """Measures the peak RSS of this process while running a function.
+    ru_maxrss can't be used, since Linux carries it over from the parent across fork and exec.
+    Instead the kernel's high water mark is reset, or RSS is sampled where that isn't allowed.
+
+    Args:
+        run_fn (function): function to run.
+        sample_interval (float): seconds between RSS samples, if the high water mark can't be reset.
+
+    Returns:
+        (int): peak RSS in KB while run_fn ran.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="utf-8") as clear_refs_file:
+            clear_refs_file.write("5")
+    except OSError:
+        peak_rss = get_current_rss_kb()
+        is_done = threading.Event()
+
+        def sample_rss():
+            nonlocal peak_rss
+            while not is_done.wait(sample_interval):
+                peak_rss = max(peak_rss, get_current_rss_kb())
+
+        sampler = threading.Thread(target=sample_rss, daemon=True)
+        sampler.start()
+        try:
+            run_fn()
+        finally:
+            is_done.set()
+            sampler.join()
+        return max(peak_rss, get_current_rss_kb())
+
+    run_fn()
+    with open("/proc/self/status", "r", encoding="utf-8") as status_file:
+        for line in status_file:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+
+    raise OSError("VmHWM is missing from /proc/self/status.")
+
+
+def measure_solver(day_num, part_num, input_file):
+    """Measures a solver in the current process, which should be fresh for peak RSS to be useful.
+
+    Args:
+        day_num (int): number for the day.
+        part_num (int): number for the part.
+        input_file (string): filename to solve.
+
+    Returns:
+        (dict): wall seconds, tracemalloc peak bytes, number of blocks allocated by the solver
+            that are still held when it returns, peak RSS in KB, and growth in KB of peak RSS
+            over the RSS before the solver ran.
+    """
+    # load the solver first, so imports aren't counted towards the solver's memory
+    solver = load_day.get_part_solvers(day_num)[part_num]
+    start_rss = get_current_rss_kb()
+
+    # time and measure RSS without tracemalloc, since tracing slows down and adds allocations
+    start_time = time.perf_counter()
+    peak_rss = measure_peak_rss_kb(lambda: solver(input_file))
+    seconds = time.perf_counter() - start_time
+
+    # keep the answer alive while counting blocks, so only what the solver holds on to counts
+    tracemalloc.start()
+    answer = solver(input_file)
+    _, tracemalloc_peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)])
+    tracemalloc.stop()
+    allocated_blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    del answer
+
+    return {"seconds": seconds, "tracemalloc_peak_bytes": tracemalloc_peak,
+            "allocated_blocks": allocated_blocks, "peak_rss_kb": peak_rss,
+            "rss_growth_kb": max(0, peak_rss - start_rss)}
+
+
+def run_benchmarks(day_nums, scales, seed):
+    """Benchmarks both parts of each day at each scale, each in a fresh process.
+
+    Args:
+        day_nums ([int]): days to benchmark.
+        scales ([int]): input size multipliers.
+        seed (int): seed for generated inputs.
+
+    Returns:
+        (dict): "dayX_ptY@scale": measurements for that solver and input size.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for day_num in day_nums:
+            for scale in scales:
+                input_file = os.path.join(temp_dir, f"day{day_num}_{scale}.txt")
+                with open(input_file, "w", encoding="utf-8") as benchmark_file:
+                    benchmark_file.write(
+                        generate_benchmark_input(day_num, scale, random.Random(seed)))
+
+                for part_num in sorted(load_day.get_part_solvers(day_num)):
+                    output = subprocess.run(
+                        [sys.executable, __file__, "measure", str(day_num), str(part_num),
+                         input_file], capture_output=True, text=True, check=True).stdout
+                    results[f"day{day_num}_pt{part_num}@{scale}"] = json.loads(output)
+
+    return results
+
+
+def find_regressions(results, baseline, threshold, metrics):
+    """Compares benchmark results to a baseline.
+
+    Args:
+        results (dict): benchmark results from run_benchmarks.
+        baseline (dict): earlier benchmark results.
+        threshold (float): allowed fractional increase, such as 0.2 for 20%.
+        metrics (dict): name of each metric to compare: absolute increase that is always
+            allowed, so tiny baselines don't fail on noise.
+
+    Returns:
+        [string]: description of each metric that regressed.
+    """
+    regressions = []
+    for key, measurements in results.items():
+        if key not in baseline:
+            continue
+
+        for metric, min_increase in metrics.items():
+            if metric not in baseline[key]:
+                continue
+
+            baseline_value = baseline[key][metric]
+            if measurements[metric] > max(baseline_value * (1 + threshold),
+                                          baseline_value + min_increase):
+                regressions.append(f"{key} {metric}: {measurements[metric]} "
+                                   f"vs baseline {baseline_value}")
+
+    return regressions
+
+
+def main(day_nums, scales, seed, baseline_file, update_baseline, threshold, check_time):
+    """Runs benchmarks, prints results, and either stores or checks against a baseline.
+
+    Args:
+        day_nums ([int]): days to benchmark.
+        scales ([int]): input size multipliers.
+        seed (int): seed for generated inputs.
+        baseline_file (string): JSON file with baseline results.
+        update_baseline (boolean): whether to write results to the baseline file.
+        threshold (float): allowed fractional increase over baseline.
+        check_time (boolean): whether wall time regressions also fail.
+
+    Returns:
+        int: exit code, 1 if any metric regressed beyond the threshold.
+    """
+    results = run_benchmarks(day_nums, scales, seed)
+    for key, measurements in results.items():
+        print(f"{key:>14}: {measurements['seconds']:8.4f}s, "
+              f"tracemalloc peak {measurements['tracemalloc_peak_bytes'] / 1024:10.1f} KB, "
+              f"blocks {measurements['allocated_blocks']:7d}, "
+              f"RSS growth {measurements['rss_growth_kb']:8d} KB")
+
+    if update_baseline:
+        # keep baseline entries for days and scales that weren't run this time
+        baseline = {}
+        if os.path.exists(baseline_file):
+            with open(baseline_file, "r", encoding="utf-8") as existing_file:
+                baseline = json.load(existing_file)
+        baseline.update(results)
+
+        with open(baseline_file, "w", encoding="utf-8") as output_file:
+            json.dump(baseline, output_file, indent=4, sort_keys=True)
+        print(f"\nWrote baseline to {baseline_file}")
+        return 0
+
+    if not os.path.exists(baseline_file):
+        print(f"\nNo baseline at {baseline_file}, run with --update-baseline to create one.")
+        return 0
+
+    with open(baseline_file, "r", encoding="utf-8") as input_file:
+        baseline = json.load(input_file)
+
+    # RSS moves in whole pages and allocator arenas, and a few blocks come and go with interpreter
+    # caches, so allow a small absolute increase for both
+    metrics = {"tracemalloc_peak_bytes": 0, "allocated_blocks": 64, "rss_growth_kb": 256}
+    if check_time:
+        metrics["seconds"] = 0
+    regressions = find_regressions(results, baseline, threshold, metrics)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "measure":
+        # internal command used to measure a single solver in a fresh process
+        print(json.dumps(measure_solver(int(sys.argv[2]), int(sys.argv[3]), sys.argv[4])))
+        sys.exit(0)
+
+    # create argument parser
+    parser = argparse.ArgumentParser(
+        description="Benchmarks time and memory for Advent of Code solvers.")
+    parser.add_argument("-d", "--days", type=int, nargs="+", default=list(range(1, 8)),
+                        help="Days to benchmark.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 4],
+                        help="Input size multipliers.")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Seed for generated inputs.")
+    parser.add_argument("-b", "--baseline", type=str, default="benchmark_baseline.json",
+                        help="JSON file with baseline results.")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write results to the baseline file instead of checking them.")
+    parser.add_argument("-t", "--threshold", type=float, default=0.2,
+                        help="Allowed fractional increase in memory over baseline.")
+    parser.add_argument("--check-time", action="store_true",
+                        help="Also fail when wall time increases beyond the threshold.")
+
+    # parse args and call main
+    args = parser.parse_args()
+    sys.exit(main(args.days, args.scales, args.seed, args.baseline, args.update_baseline,
+                  args.threshold, args.check_time))
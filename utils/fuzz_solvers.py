@@ -0,0 +1,455 @@
+"""
+This module provides a differential fuzzing harness for Advent of Code solutions.
+Random inputs (seeded, with edge cases) are solved by the reference solver for a day and by every
+alternative backend for that day, and any disagreement is reported along with the speedup of each
+backend over the reference.
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent))
+import load_day
+import read_input
+import telemetry_pipeline
+
+
+# part of each day that backends are checked against
+REFERENCE_PARTS = {1: 1, 2: 2, 3: 2, 4: 2, 5: 2, 6: 2, 7: 2}
+
+
+def generate_day1_input(rng):
+    """Generates depth readings, including plateaus and fewer readings than a window.
+
+    Args:
+        rng (random.Random): random number generator.
+
+    Returns:
+        string: content for an input file.
+    """
+    n_values = rng.choice([1, 2, 3, 4, rng.randint(5, 200)])
+    max_value = rng.choice([2, 10, 10000])
+    return "\n".join(str(rng.randint(0, max_value)) for _ in range(n_values))
+
+
+def generate_day2_input(rng):
+    """Generates submarine commands, including aiming up above the surface.
+
+    Args:
+        rng (random.Random): random number generator.
+
+    Returns:
+        string: content for an input file.
+    """
+    n_commands = rng.randint(1, 200)
+    commands = [f"{rng.choice(['forward', 'down', 'up'])} {rng.randint(0, 9)}"
+                for _ in range(n_commands)]
+    return "\n".join(commands)
+
+
+def has_co2_rating(rows, n_bits):
+    """Checks whether filtering rows by their least common bits always leaves a row, which fails
+    when 2+ rows are left that all share the next bit.
+
+    Args:
+        rows ([int]): binary report rows.
+        n_bits (int): number of bits in each row.
+
+    Returns:
+        boolean: whether the rows have a CO2 scrubber rating.
+    """
+    for bit_index in range(n_bits - 1, -1, -1):
+        if len(rows) == 1:
+            return True
+
+        ones = [row for row in rows if row >> bit_index & 1]
+        zeros = [row for row in rows if not row >> bit_index & 1]
+        if len(ones) == 0 or len(zeros) == 0:
+            return False
+        rows = ones if len(ones) < len(zeros) else zeros
+
+    return True
+
+
+def generate_day3_input(rng):
+    """Generates unique binary reports, with few bits so bit counts are often tied.
+    Reports without a CO2 scrubber rating are generated again, since no answer exists for them.
+
+    Args:
+        rng (random.Random): random number generator.
+
+    Returns:
+        string: content for an input file.
+    """
+    while True:
+        n_bits = rng.randint(1, 12)
+        n_rows = rng.randint(1, min(2 ** n_bits, 100))
+        rows = rng.sample(range(2 ** n_bits), n_rows)
+        if has_co2_rating(rows, n_bits):
+            return "\n".join(f"{row:0{n_bits}b}" for row in rows)
+
+
+def generate_day4_input(rng):
+    """Generates bingo draws and boards, including duplicate boards that win on the same turn.
+
+    Args:
+        rng (random.Random): random number generator.
+
+    Returns:
+        string: content for an input file.
+    """
+    # draw every number so that every board eventually wins
+    drawn_numbers = list(range(100))
+    rng.shuffle(drawn_numbers)
+
+    boards = []
+    for _ in range(rng.randint(1, 20)):
+        if len(boards) > 0 and rng.random() < 0.2:
+            boards.append(rng.choice(boards))
+        else:
+            boards.append(rng.sample(range(100), 25))
+
+    board_strs = ["\n".join(" ".join(f"{num:2}" for num in board[row * 5:(row + 1) * 5])
+                            for row in range(5))
+                  for board in boards]
+    return ",".join(str(num) for num in drawn_numbers) + "\n\n" + "\n\n".join(board_strs)
+
+
+def generate_day5_input(rng):
+    """Generates vent lines, including single point segments and repeated segments.
+
+    Args:
+        rng (random.Random): random number generator.
+
+    Returns:
+        string: content for an input file.
+    """
+    max_coord = rng.choice([1, 5, 50])
+    segments = []
+    for _ in range(rng.randint(1, 60)):
+        start_x = rng.randint(0, max_coord)
+        start_y = rng.randint(0, max_coord)
+        length = rng.randint(0, max_coord)
+        direction = rng.choice(["point", "horizontal", "vertical", "diagonal", "repeat"])
+
+        if direction == "repeat" and len(segments) > 0:
+            segments.append(rng.choice(segments))
+            continue
+
+        end_x, end_y = start_x, start_y
+        if direction in ("horizontal", "diagonal"):
+            end_x = min(max(start_x + rng.choice([-1, 1]) * length, 0), max_coord)
+        if direction == "vertical":
+            end_y = min(max(start_y + rng.choice([-1, 1]) * length, 0), max_coord)
+        if direction == "diagonal":
+            end_y = start_y + rng.choice([-1, 1]) * abs(end_x - start_x)
+            if end_y < 0:
+                end_y = start_y + abs(end_x - start_x)
+
+        segments.append(f"{start_x},{start_y} -> {end_x},{end_y}")
+
+    return "\n".join(segments)
+
+
+def generate_day6_input(rng):
+    """Generates lanternfish timers, including fish that spawn on the first day.
+
+    Args:
+        rng (random.Random): random number generator.
+
+    Returns:
+        string: content for an input file.
+    """
+    n_fishes = rng.randint(1, 300)
+    return ",".join(str(rng.randint(0, 8)) for _ in range(n_fishes))
+
+
+def generate_day7_input(rng):
+    """Generates crab positions, including a single crab and all crabs at one position.
+
+    Args:
+        rng (random.Random): random number generator.
+
+    Returns:
+        string: content for an input file.
+    """
+    n_crabs = rng.choice([1, 2, rng.randint(3, 100)])
+    max_pos = rng.choice([0, 3, 200])
+    return ",".join(str(rng.randint(0, max_pos)) for _ in range(n_crabs))
+
+
+INPUT_GENERATORS = {
+    1: generate_day1_input,
+    2: generate_day2_input,
+    3: generate_day3_input,
+    4: generate_day4_input,
+    5: generate_day5_input,
+    6: generate_day6_input,
+    7: generate_day7_input,
+}
+
+
+def day1_depth_tracker(input_file):
+    """Solves day 1 part 1 with the incremental DepthTracker."""
+    day1 = load_day.load_day_module(1)
+    tracker = day1.DepthTracker()
+    for line in read_input.iter_lines_from_file(input_file):
+        tracker.update(int(line))
+    return tracker.increasing_count
+
+
+def day1_depth_query(input_file):
+    """Solves day 1 part 1 with the cached prefix sums from DepthQuery."""
+    day1 = load_day.load_day_module(1)
+    query = day1.DepthQuery(day1.parse_inputs(read_input.read_lines_from_file(input_file)))
+    return query.increasing_count(1)
+
+
+def day1_telemetry_feed(input_file):
+    """Solves day 1 part 1 with the telemetry pipeline reading from a local feed process."""
+    return asyncio.run(telemetry_pipeline.run_pipeline(1, f"feed:{input_file}"))["part1"]
+
+
+def day2_submarine_tracker(input_file):
+    """Solves day 2 part 2 with the incremental SubmarineTracker."""
+    day2 = load_day.load_day_module(2)
+    tracker = day2.SubmarineTracker()
+    for line in read_input.iter_lines_from_file(input_file):
+        command, value = line.split()
+        tracker.update(command, int(value))
+    return tracker.pt2_position()
+
+
+def day2_telemetry_feed(input_file):
+    """Solves day 2 part 2 with the telemetry pipeline reading from a local feed process."""
+    return asyncio.run(telemetry_pipeline.run_pipeline(2, f"feed:{input_file}"))["part2"]
+
+
+def day3_packed_report(input_file):
+    """Solves day 3 part 2 with filters on the packed bit matrix."""
+    day3 = load_day.load_day_module(3)
+    packed, n_bits = day3.pack_report(read_input.iter_lines_from_file(input_file))
+    return day3.packed_life_support(packed, n_bits)
+
+
+def day4_bingo_deck(input_file):
+    """Solves day 4 part 2 with the streaming parser and compact BingoDeck."""
+    day4 = load_day.load_day_module(4)
+    drawn_numbers, board_views = day4.stream_inputs(read_input.iter_lines_from_file(input_file))
+    deck = next(board_views).deck
+    for _ in board_views:
+        pass
+
+    last_score = None
+    for drawn_number in drawn_numbers:
+        for board_index in deck.mark_number(drawn_number):
+            last_score = deck[board_index].compute_final_board_score() * drawn_number
+    return last_score
+
+
+def day4_bingo_tournament(input_file):
+    """Solves day 4 part 2 with boards sharded across processes in shared memory."""
+    day4 = load_day.load_day_module(4)
+    drawn_numbers, board_views = day4.stream_inputs(read_input.iter_lines_from_file(input_file),
+                                                    index_numbers=False)
+    deck = next(board_views).deck
+    for _ in board_views:
+        pass
+
+    ranking, _, scores = day4.play_bingo_tournament(drawn_numbers, deck, n_workers=2)
+    return int(scores[ranking[-1]])
+
+
+def day5_vent_map(input_file):
+    """Solves day 5 part 2 with the incremental VentMap."""
+    day5 = load_day.load_day_module(5)
+    vent_map = day5.VentMap(include_diagonal=True)
+    for start_coord, end_coord in day5.parse_input(read_input.read_lines_from_file(input_file)):
+        vent_map.add_segment(start_coord, end_coord)
+    return vent_map.overlap_count()
+
+
+def day5_tiled_grid(input_file):
+    """Solves day 5 part 2 with the memory-mapped TiledVentGrid, using small tiles."""
+    day5 = load_day.load_day_module(5)
+    segments = day5.parse_input(read_input.read_lines_from_file(input_file))
+    width = max(max(start[0], end[0]) for start, end in segments) + 1
+    height = max(max(start[1], end[1]) for start, end in segments) + 1
+    with day5.TiledVentGrid(width, height, tile_size=16) as grid:
+        return grid.rasterize(segments, include_diagonal=True)
+
+
+def day5_parallel_bands(input_file):
+    """Solves day 5 part 2 with row bands rasterized in parallel into shared memory."""
+    day5 = load_day.load_day_module(5)
+    segments = day5.parse_input(read_input.read_lines_from_file(input_file))
+    return day5.count_overlaps_parallel(segments, include_diagonal=True, n_workers=2)
+
+
+def day6_lanternfish_model(input_file):
+    """Solves day 6 part 2 with the ring buffer LanternfishModel."""
+    day6 = load_day.load_day_module(6)
+    model = day6.LanternfishModel(day6.parse_input(read_input.read_lines_from_file(input_file)))
+    for _ in model.population_by_day(256):
+        pass
+    return model.population
+
+
+def day6_lanternfish_query(input_file):
+    """Solves day 6 part 2 with transition matrix powers from LanternfishQuery."""
+    day6 = load_day.load_day_module(6)
+    query = day6.LanternfishQuery(day6.parse_input(read_input.read_lines_from_file(input_file)))
+    return query.population(256)
+
+
+def day7_alignment_query(input_file):
+    """Solves day 7 part 2 with the histogram prefix sums from CrabAlignmentQuery."""
+    day7 = load_day.load_day_module(7)
+    query = day7.CrabAlignmentQuery(day7.parse_input(read_input.read_lines_from_file(input_file)))
+    return query.min_cost(day7.TRIANGULAR_FUEL)
+
+
+def day7_alignment_engine(input_file):
+    """Solves day 7 part 2 with ternary search in the histogram-based AlignmentEngine."""
+    day7 = load_day.load_day_module(7)
+    engine = day7.AlignmentEngine(day7.parse_input(read_input.read_lines_from_file(input_file)))
+    return engine.min_cost(day7.TRIANGULAR_FUEL)[1]
+
+
+# alternative backends for each day, all of which should match the reference part
+BACKENDS = {
+    1: {"depth_tracker": day1_depth_tracker, "depth_query": day1_depth_query,
+        "telemetry_feed": day1_telemetry_feed},
+    2: {"submarine_tracker": day2_submarine_tracker, "telemetry_feed": day2_telemetry_feed},
+    3: {"packed_report": day3_packed_report},
+    4: {"bingo_deck": day4_bingo_deck, "bingo_tournament": day4_bingo_tournament},
+    5: {"vent_map": day5_vent_map, "tiled_grid": day5_tiled_grid,
+        "parallel_bands": day5_parallel_bands},
+    6: {"lanternfish_model": day6_lanternfish_model, "lanternfish_query": day6_lanternfish_query},
+    7: {"alignment_query": day7_alignment_query, "alignment_engine": day7_alignment_engine},
+}
+
+
+def time_solver(solver, input_file):
+    """Runs a solver and times it.
+
+    Args:
+        solver (function): solver that takes an input filename.
+        input_file (string): filename to solve.
+
+    Returns:
+        (any): answer from solver.
+        (float): elapsed seconds.
+    """
+    start_time = time.perf_counter()
+    answer = solver(input_file)
+    return answer, time.perf_counter() - start_time
+
+
+def fuzz_day(day_num, n_iterations, seed):
+    """Checks every backend for a day against the reference solver on random inputs.
+
+    Args:
+        day_num (int): number for the day.
+        n_iterations (int): number of random inputs to check.
+        seed (int): seed for random inputs.
+
+    Returns:
+        [dict]: failures, each with the seed, backend, answers, and input that disagreed.
+        (dict): backend name: total seconds spent, including "reference".
+        (int): number of inputs the reference solver rejected with an error, which every
+            backend must reject too.
+    """
+    reference = load_day.get_part_solvers(day_num)[REFERENCE_PARTS[day_num]]
+    backends = BACKENDS[day_num]
+    total_seconds = {name: 0.0 for name in ["reference", *backends]}
+    failures = []
+    n_rejected = 0
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_file = os.path.join(temp_dir, "input.txt")
+        for iteration in range(n_iterations):
+            # each input has its own seed so a failure can be reproduced by itself
+            input_seed = seed + iteration
+            input_text = INPUT_GENERATORS[day_num](random.Random(input_seed))
+            with open(input_file, "w", encoding="utf-8") as fuzz_file:
+                fuzz_file.write(input_text)
+
+            # inputs that the reference can't solve are still checked, since backends must fail too
+            reference_failed = False
+            try:
+                expected, elapsed = time_solver(reference, input_file)
+            except Exception as error:  # pylint: disable=broad-except
+                expected, elapsed = f"{type(error).__name__}: {error}", 0.0
+                reference_failed = True
+                n_rejected += 1
+            total_seconds["reference"] += elapsed
+
+            for name, backend in backends.items():
+                backend_failed = False
+                try:
+                    answer, elapsed = time_solver(backend, input_file)
+                except Exception as error:  # pylint: disable=broad-except
+                    answer, elapsed = f"{type(error).__name__}: {error}", 0.0
+                    backend_failed = True
+                total_seconds[name] += elapsed
+
+                # errors only need to agree on failing, not on their type or message
+                if backend_failed != reference_failed or (
+                        not reference_failed and answer != expected):
+                    failures.append({"day": day_num, "seed": input_seed, "backend": name,
+                                     "expected": expected, "answer": answer,
+                                     "input": input_text})
+
+    return failures, total_seconds, n_rejected
+
+
+def main(day_nums, n_iterations, seed):
+    """Fuzzes each day, printing speedups and any disagreements.
+
+    Args:
+        day_nums ([int]): days to fuzz.
+        n_iterations (int): number of random inputs per day.
+        seed (int): seed for random inputs.
+
+    Returns:
+        int: exit code, 1 if any backend disagreed with the reference.
+    """
+    all_failures = []
+    for day_num in day_nums:
+        failures, total_seconds, n_rejected = fuzz_day(day_num, n_iterations, seed)
+        all_failures += failures
+
+        reference_seconds = total_seconds.pop("reference")
+        print(f"Day {day_num}: {n_iterations} inputs, {n_rejected} rejected, "
+              f"{len(failures)} failures, reference {reference_seconds:.3f}s")
+        for name, seconds in total_seconds.items():
+            speedup = reference_seconds / seconds if seconds > 0 else float("inf")
+            print(f"    {name}: {seconds:.3f}s ({speedup:.2f}x)")
+
+    for failure in all_failures[:10]:
+        print(f"\nDay {failure['day']} backend {failure['backend']} failed on seed "
+              f"{failure['seed']}: expected {failure['expected']}, got {failure['answer']}")
+        print(failure["input"])
+
+    return 1 if len(all_failures) > 0 else 0
+
+
+if __name__ == "__main__":
+    # create argument parser
+    parser = argparse.ArgumentParser(
+        description="Cross-checks alternative solvers against the reference solver for each day.")
+    parser.add_argument("-d", "--days", type=int, nargs="+", default=sorted(INPUT_GENERATORS),
+                        help="Days to fuzz.")
+    parser.add_argument("-n", "--iterations", type=int, default=100,
+                        help="Number of random inputs per day.")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Seed for random inputs.")
+
+    # parse args and call main
+    args = parser.parse_args()
+    sys.exit(main(args.days, args.iterations, args.seed))
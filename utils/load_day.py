@@ -0,0 +1,66 @@
+"""
+This module provides utility functions for loading the solution module for a day in Advent of Code.
+"""
+from functools import partial
+from pathlib import Path
+import importlib.util
+import sys
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# day modules import utils with a path relative to the repo root
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+
+def load_day_module(day_num):
+    """Imports the solution module for a day, such as 05/day5.py. Modules are only loaded once.
+
+    Args:
+        day_num (int): number for the day.
+
+    Returns:
+        module: loaded dayX module.
+    """
+    module_name = f"day{day_num}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    module_path = REPO_ROOT / f"{day_num:02}" / f"{module_name}.py"
+    if not module_path.exists():
+        raise FileNotFoundError(f"No solution module found for day {day_num} at {module_path}.")
+
+    # make modules next to the day module importable, the same as running it as a script
+    if str(module_path.parent) not in sys.path:
+        sys.path.append(str(module_path.parent))
+
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def get_part_solvers(day_num):
+    """Gets the solver for each part of a day, each taking an input filename.
+
+    Args:
+        day_num (int): number for the day.
+
+    Returns:
+        (dict): part number: function that solves that part given an input filename.
+    """
+    module = load_day_module(day_num)
+
+    solvers = {}
+    for part_num in (1, 2):
+        solver = getattr(module, f"day{day_num}_pt{part_num}", None)
+        if solver is not None:
+            solvers[part_num] = solver
+
+    # edge case: day 1 part 2 is named day2_pt2 and takes the window size for the puzzle
+    if day_num == 1:
+        solvers[2] = partial(module.day2_pt2, window_size=3)
+
+    return solvers
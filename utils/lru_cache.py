@@ -0,0 +1,69 @@
+"""
+This module provides a size-bounded least recently used (LRU) cache with hit/miss statistics.
+"""
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Cache that evicts the least recently used entry once it holds maxsize entries.
+    """
+    def __init__(self, maxsize=128):
+        """Constructor
+
+        Args:
+            maxsize (int): max number of entries to keep.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get_or_compute(self, key, compute_fn):
+        """Gets the cached value for key, or computes and caches it if missing.
+
+        Args:
+            key (hashable): key for value.
+            compute_fn (function): takes no arguments and returns the value for key.
+
+        Returns:
+            (any): cached or newly computed value.
+        """
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        self.misses += 1
+        value = compute_fn()
+        self.entries[key] = value
+
+        # evict least recently used entry
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+        return value
+
+    def clear(self):
+        """Removes all entries and resets statistics.
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Gets statistics for the cache.
+
+        Returns:
+            (dict): hits, misses, current size, and maxsize of the cache.
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self.entries), "maxsize": self.maxsize}
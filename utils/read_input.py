@@ -34,3 +34,16 @@ def read_text_from_file(file_name):
         read_string = input_file.read()
 
     return read_string
+
+
+def iter_lines_from_file(file_name):
+    """Lazily reads in data from an input file, one line at a time.
+
+    Args:
+        file_name (string): filename to read in.
+
+    Yields:
+        string: next line from file_name.
+    """
+    with open(file_name, "r", encoding="utf-8") as input_file:
+        yield from input_file
@@ -0,0 +1,313 @@
+"""
+This module provides an asyncio pipeline for solving days 1 and 2 of Advent of Code from live
+telemetry, such as depth readings or submarine commands streamed over a socket, pipe, or file.
+Records are read into a bounded queue, so a slow consumer applies backpressure to the reader,
+and are applied to incremental state in micro-batches.
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import os
+import stat
+import sys
+import time
+
+sys.path.append(str(Path(__file__).resolve().parent))
+import load_day
+
+
+def create_handler(day_num, window_size=3):
+    """Creates incremental state for a day and functions to update and summarize it.
+
+    Args:
+        day_num (int): number for the day, either 1 or 2.
+        window_size (int): size of rolling window for day 1.
+
+    Returns:
+        (function): takes a record line and updates the state in O(1).
+        (function): returns a dict with the current answer for each part.
+    """
+    module = load_day.load_day_module(day_num)
+
+    if day_num == 1:
+        tracker = module.DepthTracker(window_size)
+
+        def update(line):
+            tracker.update(int(line))
+
+        def summarize():
+            return {"part1": tracker.increasing_count, "part2": tracker.window_increasing_count}
+
+    elif day_num == 2:
+        tracker = module.SubmarineTracker()
+
+        def update(line):
+            command, value = line.split()
+            tracker.update(command, int(value))
+
+        def summarize():
+            return {"part1": tracker.pt1_position(), "part2": tracker.pt2_position()}
+
+    else:
+        raise ValueError(f"Day {day_num} does not support telemetry, only days 1 and 2.")
+
+    return update, summarize
+
+
+async def iter_stream_lines(stream_reader):
+    """Reads decoded lines from an asyncio StreamReader.
+
+    Args:
+        stream_reader (asyncio.StreamReader): reader for a socket, pipe, or process output.
+
+    Yields:
+        string: next line from the stream.
+    """
+    async for line in stream_reader:
+        yield line.decode("utf-8")
+
+
+async def iter_file_lines(file_name, follow, poll_interval=0.1):
+    """Reads lines from a file, optionally waiting for new lines like `tail -f`.
+
+    Args:
+        file_name (string): filename to read in.
+        follow (boolean): whether to keep waiting for new lines at the end of the file.
+        poll_interval (float): seconds to wait before checking for new lines.
+
+    Yields:
+        string: next line from the file.
+    """
+    with open(file_name, "r", encoding="utf-8") as input_file:
+        async for line in iter_open_file_lines(input_file, follow, poll_interval):
+            yield line
+
+
+async def iter_open_file_lines(input_file, follow, poll_interval=0.1):
+    """Reads lines from an open file, optionally waiting for new lines like `tail -f`.
+
+    Args:
+        input_file (file): text file to read from.
+        follow (boolean): whether to keep waiting for new lines at the end of the file.
+        poll_interval (float): seconds to wait before checking for new lines.
+
+    Yields:
+        string: next line from the file.
+    """
+    partial_line = ""
+    while True:
+        line = input_file.readline()
+
+        # wait for more data at the end of the file, keeping any partially written line
+        if line == "" or not line.endswith("\n"):
+            partial_line += line
+            if not follow:
+                break
+            await asyncio.sleep(poll_interval)
+            continue
+
+        yield partial_line + line
+        partial_line = ""
+
+    if partial_line != "":
+        yield partial_line
+
+
+async def iter_source_lines(source):
+    """Reads lines from a telemetry source.
+
+    Args:
+        source (string): one of "-" (stdin), "tcp:HOST:PORT", "unix:PATH", "file:PATH",
+            "tail:PATH", or "feed:PATH[:RATE]", which spawns a local feed process that replays
+            PATH at RATE records per second.
+
+    Yields:
+        string: next line from the source.
+    """
+    kind, _, location = source.partition(":")
+    loop = asyncio.get_running_loop()
+
+    if source == "-":
+        # the event loop can only watch pipes, sockets, and terminals, so read files directly
+        stdin_mode = os.fstat(sys.stdin.fileno()).st_mode
+        if not (stat.S_ISFIFO(stdin_mode) or stat.S_ISSOCK(stdin_mode)
+                or stat.S_ISCHR(stdin_mode)):
+            async for line in iter_open_file_lines(sys.stdin, follow=False):
+                yield line
+            return
+
+        stream_reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(stream_reader), sys.stdin)
+        async for line in iter_stream_lines(stream_reader):
+            yield line
+
+    elif kind == "tcp":
+        host, _, port = location.rpartition(":")
+        stream_reader, stream_writer = await asyncio.open_connection(host, int(port))
+        async for line in iter_stream_lines(stream_reader):
+            yield line
+        stream_writer.close()
+
+    elif kind == "unix":
+        stream_reader, stream_writer = await asyncio.open_unix_connection(location)
+        async for line in iter_stream_lines(stream_reader):
+            yield line
+        stream_writer.close()
+
+    elif kind in ("file", "tail"):
+        async for line in iter_file_lines(location, follow=kind == "tail"):
+            yield line
+
+    elif kind == "feed":
+        input_file, _, rate = location.partition(":")
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, __file__, "feed", input_file, "--rate", rate or "0",
+            stdout=asyncio.subprocess.PIPE)
+        try:
+            async for line in iter_stream_lines(process.stdout):
+                yield line
+        finally:
+            # stop the feed if reading ends early, such as when the generator is closed
+            if process.returncode is None and not process.stdout.at_eof():
+                process.kill()
+            await process.wait()
+
+        if process.returncode != 0:
+            raise RuntimeError(f"Feed process for {input_file} exited with {process.returncode}.")
+
+    else:
+        raise ValueError(f"Unknown telemetry source: {source}")
+
+
+async def produce(source, queue):
+    """Reads lines from a source into a queue, waiting whenever the queue is full.
+
+    Args:
+        source (string): telemetry source, see iter_source_lines.
+        queue (asyncio.Queue): bounded queue of lines, ended with None, or with the error that
+            stopped the source early.
+    """
+    try:
+        async for line in iter_source_lines(source):
+            line = line.strip()
+            if line != "":
+                await queue.put(line)
+    except Exception as error:
+        # pass the error on, so the consumer stops without reporting answers for a partial feed
+        await queue.put(error)
+        raise
+
+    await queue.put(None)
+
+
+async def consume(queue, update, summarize, batch_size, on_batch):
+    """Applies lines from a queue to incremental state in micro-batches.
+
+    Args:
+        queue (asyncio.Queue): bounded queue of lines, ended with None, or with the error that
+            stopped the source early.
+        update (function): takes a record line and updates the state.
+        summarize (function): returns a dict with the current answer for each part.
+        batch_size (int): max number of records to apply before reporting answers.
+        on_batch (function): called with the answers and record count after each batch.
+
+    Returns:
+        (dict): answers after all records have been applied.
+
+    Raises:
+        Exception: the error that stopped the source, before reporting the batch it ended.
+    """
+    n_records = 0
+    is_done = False
+    while not is_done:
+        # wait for at least one record, then take whatever else is ready up to batch_size
+        batch = [await queue.get()]
+        while len(batch) < batch_size and not queue.empty():
+            batch.append(queue.get_nowait())
+
+        for line in batch:
+            if line is None:
+                is_done = True
+                break
+            if isinstance(line, Exception):
+                raise line
+
+            update(line)
+            n_records += 1
+
+        if on_batch is not None:
+            on_batch(summarize(), n_records)
+
+    return summarize()
+
+
+async def run_pipeline(day_num, source, queue_size=1024, batch_size=256, on_batch=None):
+    """Solves a day from a telemetry source, updating answers as records arrive.
+
+    Args:
+        day_num (int): number for the day, either 1 or 2.
+        source (string): telemetry source, see iter_source_lines.
+        queue_size (int): max number of records waiting to be applied.
+        batch_size (int): max number of records to apply before reporting answers.
+        on_batch (function, optional): called with the answers and record count after each batch.
+
+    Returns:
+        (dict): answers after the source has ended.
+    """
+    update, summarize = create_handler(day_num)
+    queue = asyncio.Queue(maxsize=queue_size)
+
+    answers, _ = await asyncio.gather(consume(queue, update, summarize, batch_size, on_batch),
+                                      produce(source, queue))
+
+    return answers
+
+
+def feed(input_file, rate):
+    """Replays an input file to stdout to stand in for a live telemetry feed.
+
+    Args:
+        input_file (string): filename to replay.
+        rate (float): records per second. Replays as fast as possible if 0.
+    """
+    start_time = time.perf_counter()
+    with open(input_file, "r", encoding="utf-8") as replay_file:
+        for record_index, line in enumerate(replay_file):
+            # sleep until this record is due
+            if rate > 0:
+                time.sleep(max(0, start_time + record_index / rate - time.perf_counter()))
+
+            sys.stdout.write(line if line.endswith("\n") else line + "\n")
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    # create argument parser
+    parser = argparse.ArgumentParser(
+        description="Solves days 1 and 2 of Advent of Code from live telemetry.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run pipeline and print answers per batch.")
+    run_parser.add_argument("day_num", type=int, help="Number of day.")
+    run_parser.add_argument("source", type=str,
+                            help="-, tcp:HOST:PORT, unix:PATH, file:PATH, tail:PATH, or "
+                                 "feed:PATH[:RATE].")
+    run_parser.add_argument("--queue-size", type=int, default=1024,
+                            help="Max number of records waiting to be applied.")
+    run_parser.add_argument("--batch-size", type=int, default=256,
+                            help="Max number of records per micro-batch.")
+
+    feed_parser = subparsers.add_parser("feed", help="Replay an input file to stdout.")
+    feed_parser.add_argument("input_file", type=str, help="Input file to replay.")
+    feed_parser.add_argument("--rate", type=float, default=0, help="Records per second.")
+
+    # parse args and call command
+    args = parser.parse_args()
+    if args.command == "feed":
+        feed(args.input_file, args.rate)
+    else:
+        asyncio.run(run_pipeline(
+            args.day_num, args.source, args.queue_size, args.batch_size,
+            lambda answers, n_records: print(json.dumps({"records": n_records, **answers}))))